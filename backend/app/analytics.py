@@ -0,0 +1,220 @@
+import asyncio
+import math
+import os
+import time
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import delete, func, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.app import models, jobs
+
+# Relative error of the reported percentiles. Resolution times fall in logarithmic bins
+# whose width is proportional to the value (a DDSketch-style histogram), so sketches of
+# any days, offices or device types merge by adding their bin counts
+RESOLUTION_SKETCH_ACCURACY = float(os.getenv("RESOLUTION_SKETCH_ACCURACY", "0.02"))
+GAMMA = (1 + RESOLUTION_SKETCH_ACCURACY) / (1 - RESOLUTION_SKETCH_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+BACKFILL_CHUNK_ROWS = 10000
+RESOLUTION_JOB = "resolution_stats"
+LEASE_POLL_INTERVAL = 0.1
+
+RESOLUTION_GROUPINGS = {
+    "office": ("office_id",),
+    "device_type": ("type_id",),
+    "office,device_type": ("office_id", "type_id"),
+    "none": (),
+}
+
+# (day, office_id, type_id, bin) -> [resolved_count, total_seconds]
+Deltas = Dict[Tuple[date, int, int, int], list]
+
+# ========================
+# SKETCH BINS
+# ========================
+
+def sketch_bin(seconds: float) -> int:
+    # Bin 0 holds everything resolved within a second
+    return 0 if seconds <= 1 else math.ceil(math.log(seconds) / LOG_GAMMA)
+
+def bin_value(index: int) -> float:
+    # Midpoint of the bin in relative terms, so the error is at most the accuracy either way
+    return 0.0 if index == 0 else 2 * GAMMA ** index / (GAMMA + 1)
+
+def quantile(bins: Dict[int, int], count: int, q: float) -> Optional[float]:
+    if not count:
+        return None
+    rank = q * (count - 1)
+    seen = 0
+    for index in sorted(bins):
+        seen += bins[index]
+        if seen > rank:
+            return round(bin_value(index), 1)
+    return round(bin_value(max(bins)), 1)
+
+# ========================
+# BUCKET MAINTENANCE
+# ========================
+
+def add_resolution(
+    deltas: Deltas,
+    opened_at: datetime,
+    resolved_at: Optional[datetime],
+    office_id: Optional[int],
+    type_id: Optional[int],
+    sign: int = 1,
+):
+    if resolved_at is None or opened_at is None:
+        return
+    seconds = max((resolved_at - opened_at).total_seconds(), 0.0)
+    key = (resolved_at.date(), office_id or 0, type_id or 0, sketch_bin(seconds))
+    entry = deltas.setdefault(key, [0, 0.0])
+    entry[0] += sign
+    entry[1] += sign * seconds
+
+def resolution_change(old: Tuple, new: Tuple) -> Deltas:
+    # Each side is (opened_at, resolved_at, office_id, type_id) before and after a write
+    deltas: Deltas = {}
+    if old != new:
+        add_resolution(deltas, *old, sign=-1)
+        add_resolution(deltas, *new)
+    return deltas
+
+async def bump_resolution_stats(db: AsyncSession, deltas: Deltas):
+    rows = [
+        {"day": day, "office_id": office_id, "type_id": type_id, "bin": index,
+         "resolved_count": count, "total_seconds": seconds}
+        for (day, office_id, type_id, index), (count, seconds) in sorted(deltas.items())
+        if count
+    ]
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(models.ResolutionStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day", "office_id", "type_id", "bin"],
+        set_={
+            "resolved_count": models.ResolutionStat.resolved_count + stmt.excluded.resolved_count,
+            "total_seconds": models.ResolutionStat.total_seconds + stmt.excluded.total_seconds,
+        },
+    )
+    await db.execute(stmt)
+
+def queue_resolution_stats(db: AsyncSession, deltas: Deltas):
+    # Nobody reads the buckets in the request that changes them, so the upsert on these
+    # shared rows runs after the commit instead of holding their locks until then
+    rows = [[day.isoformat(), *key, count, seconds] for (day, *key), (count, seconds) in sorted(deltas.items()) if count]
+    if rows:
+        jobs.enqueue(db, RESOLUTION_JOB, rows)
+
+@jobs.handler(RESOLUTION_JOB)
+async def apply_resolution_stats(db: AsyncSession, rows: list):
+    await bump_resolution_stats(db, {
+        (date.fromisoformat(day), office_id, type_id, index): [count, seconds]
+        for day, office_id, type_id, index, count, seconds in rows
+    })
+
+async def wait_for_leased_jobs(db: AsyncSession):
+    # Jobs a worker is running now finish (or their lease runs out) before the rebuild starts
+    deadline = time.monotonic() + jobs.JOBS_LEASE
+    while time.monotonic() < deadline:
+        leased = await db.scalar(
+            select(func.count()).select_from(models.OutboxJob).filter(
+                models.OutboxJob.name == RESOLUTION_JOB, models.OutboxJob.locked_until > models.utcnow()
+            )
+        )
+        if not leased:
+            return
+        await asyncio.sleep(LEASE_POLL_INTERVAL)
+
+async def rebuild_resolution_stats(db: AsyncSession, since: Optional[date] = None) -> int:
+    # Archived incidents still count: they were resolved, only moved out of the hot table
+    sources = []
+    for model in (models.Incident, models.IncidentArchive):
+        query = (
+            select(model.opened_at, model.resolved_at, model.office_id, models.Device.type_id)
+            .outerjoin(models.Device, models.Device.device_id == model.device_id)
+            .filter(model.resolved_at.isnot(None))
+        )
+        if since is not None:
+            query = query.filter(model.resolved_at >= datetime.combine(since, datetime.min.time()))
+        sources.append(query)
+
+    await wait_for_leased_jobs(db)
+    # Queued bucket updates are absorbed here: the recount already includes the days it
+    # rebuilds, and the rest is applied directly so it is not lost with the job. They are
+    # taken before the stats are cleared, so a worker that commits first is recounted, and
+    # one leased in between loses its row and rolls its bump back (see jobs.run_job)
+    deltas: Deltas = {}
+    queued = await db.execute(
+        delete(models.OutboxJob)
+        .where(models.OutboxJob.name == RESOLUTION_JOB)
+        .returning(models.OutboxJob.payload)
+    )
+    for rows in queued.scalars().all():
+        for day, office_id, type_id, index, count, seconds in rows:
+            day = date.fromisoformat(day)
+            if since is not None and day < since:
+                entry = deltas.setdefault((day, office_id, type_id, index), [0, 0.0])
+                entry[0] += count
+                entry[1] += seconds
+
+    stale = delete(models.ResolutionStat)
+    if since is not None:
+        stale = stale.where(models.ResolutionStat.day >= since)
+    await db.execute(stale)
+
+    resolved = 0
+    result = await db.stream(union_all(*sources).execution_options(yield_per=BACKFILL_CHUNK_ROWS))
+    async for rows in result.partitions(BACKFILL_CHUNK_ROWS):
+        for opened_at, resolved_at, office_id, type_id in rows:
+            add_resolution(deltas, opened_at, resolved_at, office_id, type_id)
+        resolved += len(rows)
+
+    keys = sorted(deltas)
+    for start in range(0, len(keys), BACKFILL_CHUNK_ROWS):
+        await bump_resolution_stats(db, {key: deltas[key] for key in keys[start:start + BACKFILL_CHUNK_ROWS]})
+    await db.commit()
+    return resolved
+
+# ========================
+# QUERIES
+# ========================
+
+async def get_resolution_stats(db: AsyncSession, date_from: date, date_to: date, group_by: str = "office,device_type"):
+    dimensions = RESOLUTION_GROUPINGS[group_by]
+    stat = models.ResolutionStat
+    keys = [getattr(stat, name) for name in dimensions]
+    result = await db.execute(
+        select(*keys, stat.bin, func.sum(stat.resolved_count), func.sum(stat.total_seconds))
+        .filter(stat.day >= date_from, stat.day <= date_to)
+        .group_by(*keys, stat.bin)
+        .having(func.sum(stat.resolved_count) > 0)
+    )
+
+    groups: dict = {}
+    for *key, index, count, seconds in result.all():
+        group = groups.setdefault(tuple(key), {"bins": {}, "count": 0, "seconds": 0.0})
+        group["bins"][index] = count
+        group["count"] += count
+        group["seconds"] += seconds
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": group_by,
+        "groups": [summarize_group(dict(zip(dimensions, key)), group) for key, group in sorted(groups.items())],
+    }
+
+def summarize_group(key: dict, group: dict) -> dict:
+    count = group["count"]
+    return {
+        # 0 is the rollup's "no office" / "no device" key
+        "office_id": key.get("office_id") or None,
+        "type_id": key.get("type_id") or None,
+        "count": count,
+        "mean_seconds": round(group["seconds"] / count, 1),
+        "p50_seconds": quantile(group["bins"], count, 0.5),
+        "p90_seconds": quantile(group["bins"], count, 0.9),
+    }
@@ -0,0 +1,207 @@
+import codecs
+import csv
+import json
+from collections import Counter
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.app import models, schemas, crud, events
+
+IMPORT_FORMATS = ("csv", "ndjson")
+INCIDENT_COLUMNS = (
+    "opened_at", "status_id", "description", "reporter_id",
+    "resolver_id", "office_id", "device_id", "updated_at",
+)
+HISTORY_COLUMNS = ("incident_id", "status_id", "date")
+
+# ========================
+# STREAM PARSING
+# ========================
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, object]]:
+    row_number = 0
+    if fmt == "ndjson":
+        async for line in iter_lines(chunks):
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                yield row_number, json.loads(line)
+            except ValueError as e:
+                yield row_number, ValueError(f"JSON inválido: {e}")
+        return
+
+    header = None
+    pending = []
+    async for line in iter_lines(chunks):
+        pending.append(line)
+        # A quoted field may span several physical lines; wait for balanced quotes
+        if sum(part.count('"') for part in pending) % 2:
+            continue
+        record = "\n".join(pending)
+        pending = []
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, ValueError(f"Se esperaban {len(header)} columnas y hay {len(values)}")
+            continue
+        yield row_number, {name: (value if value != "" else None) for name, value in zip(header, values)}
+    if pending:
+        yield row_number + 1, ValueError("Campo entrecomillado sin cerrar")
+
+# ========================
+# VALIDATION AND WRITES
+# ========================
+
+def prepare_row(record: object) -> dict:
+    if isinstance(record, Exception):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("Cada fila debe ser un objeto")
+    incident = schemas.IncidentCreate.model_validate(record)
+    row = incident.model_dump()
+    opened_at = row["opened_at"] or datetime.now(timezone.utc)
+    if opened_at.tzinfo is not None:
+        opened_at = opened_at.astimezone(timezone.utc).replace(tzinfo=None)
+    row["opened_at"] = opened_at
+    # COPY bypasses column defaults
+    row["updated_at"] = crud.utcnow()
+    return {column: row[column] for column in INCIDENT_COLUMNS}
+
+def describe_error(error: Exception) -> List[str]:
+    if isinstance(error, ValidationError):
+        return [f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()]
+    return [str(error).splitlines()[0]]
+
+def opening_history(incident_ids: List[int], rows: List[dict]) -> List[tuple]:
+    # Same opening entry create_incident writes for each new incident
+    return [(incident_id, row["status_id"], row["opened_at"]) for incident_id, row in zip(incident_ids, rows)]
+
+async def insert_rows(db: AsyncSession, rows: List[dict]):
+    result = await db.execute(
+        insert(models.Incident).returning(models.Incident.incident_id, sort_by_parameter_order=True), rows
+    )
+    history = opening_history(result.scalars().all(), rows)
+    await db.execute(insert(models.IncidentHistory), [dict(zip(HISTORY_COLUMNS, entry)) for entry in history])
+
+async def write_rows(db: AsyncSession, rows: List[dict]):
+    if db.get_bind().dialect.driver != "asyncpg":
+        await insert_rows(db, rows)
+        return
+    # COPY returns nothing, so the ids are drawn from the sequence first and the
+    # history rows can point at them
+    result = await db.execute(
+        select(func.nextval(func.pg_get_serial_sequence(models.Incident.__tablename__, "incident_id")))
+        .select_from(func.generate_series(1, len(rows)))
+    )
+    incident_ids = result.scalars().all()
+    # COPY bypasses the change_seq default as well; one value serves the whole transaction
+    change_seq = (await db.execute(select(models.next_change_seq(models.Incident.__tablename__)))).scalar()
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        models.Incident.__tablename__,
+        records=[
+            (incident_id, change_seq, *(row[column] for column in INCIDENT_COLUMNS))
+            for incident_id, row in zip(incident_ids, rows)
+        ],
+        columns=("incident_id", "change_seq", *INCIDENT_COLUMNS),
+    )
+    await raw.driver_connection.copy_records_to_table(
+        models.IncidentHistory.__tablename__,
+        records=opening_history(incident_ids, rows),
+        columns=HISTORY_COLUMNS,
+    )
+
+async def bump_stats_for_rows(db: AsyncSession, rows: List[dict]):
+    device_ids = {row["device_id"] for row in rows if row["device_id"] is not None}
+    device_types = {}
+    if device_ids:
+        result = await db.execute(
+            select(models.Device.device_id, models.Device.type_id)
+            .filter(models.Device.device_id.in_(device_ids))
+        )
+        device_types = dict(result.all())
+    keys = Counter(
+        (row["status_id"], row["office_id"] or 0, device_types.get(row["device_id"], 0))
+        for row in rows
+    )
+    await crud.bump_incident_stats(db, keys)
+
+async def flush_batch(db: AsyncSession, batch: List[Tuple[int, dict]], report: dict):
+    rows = [row for _, row in batch]
+    try:
+        await write_rows(db, rows)
+        await bump_stats_for_rows(db, rows)
+        await db.commit()
+        report["inserted"] += len(rows)
+        return
+    except Exception:
+        await db.rollback()
+
+    # The chunk failed as a whole; replay it row by row to find the offending rows
+    written = []
+    for row_number, row in batch:
+        try:
+            async with db.begin_nested():
+                await insert_rows(db, [row])
+            written.append(row)
+        except DBAPIError as e:
+            add_error(report, row_number, [str(e.orig).splitlines()[0]])
+    if written:
+        await bump_stats_for_rows(db, written)
+    await db.commit()
+    report["inserted"] += len(written)
+
+def add_error(report: dict, row_number: int, messages: List[str]):
+    report["failed"] += 1
+    if len(report["errors"]) < report["max_errors"]:
+        report["errors"].append({"row": row_number, "errors": messages})
+
+async def import_incidents(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    batch_size: int = 5000,
+    max_errors: int = 1000,
+) -> dict:
+    report = {"inserted": 0, "failed": 0, "errors": [], "max_errors": max_errors}
+    batch = []
+    async for row_number, record in iter_records(chunks, fmt):
+        try:
+            batch.append((row_number, prepare_row(record)))
+        except (ValidationError, ValueError) as e:
+            add_error(report, row_number, describe_error(e))
+            continue
+        if len(batch) >= batch_size:
+            await flush_batch(db, batch, report)
+            batch = []
+    if batch:
+        await flush_batch(db, batch, report)
+    if report["inserted"]:
+        # One coarse event instead of one per row; clients reload their incident list
+        await events.publish(db, "incident", "imported", None, {"inserted": report["inserted"]})
+        await db.commit()
+    del report["max_errors"]
+    return report
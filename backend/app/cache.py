@@ -0,0 +1,92 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+# ========================
+# TTL / LRU CACHE
+# ========================
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def pop_where(self, predicate) -> list:
+        keys = [key for key, (value, _) in self._entries.items() if predicate(value)]
+        return [self._entries.pop(key)[0] for key in keys]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+# ========================
+# AUTHENTICATED USER CACHE
+# ========================
+
+# token -> subject (email), bounded by the token's own expiry
+token_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+# subject (email) -> detached User row
+user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+def invalidate_user(*emails: Optional[str]):
+    for email in emails:
+        if email:
+            user_cache.pop(email)
+
+def invalidate_user_id(user_id: int, email: Optional[str] = None):
+    # A rename leaves the row cached under its previous email, so match on the id
+    emails = {user.email for user in user_cache.pop_where(lambda user: user.user_id == user_id)}
+    if email:
+        user_cache.pop(email)
+        emails.add(email)
+    token_cache.pop_where(lambda subject: subject in emails)
+
+def clear_users():
+    token_cache.clear()
+    user_cache.clear()
+
+def cache_stats() -> dict:
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
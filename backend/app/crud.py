@@ -1,6 +1,41 @@
+import os
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import tuple_, func, delete, insert, update, or_, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from backend.app import models, schemas, auth
+from sqlalchemy.orm import joinedload, selectinload, raiseload
+from backend.app import models, schemas, auth, cache, events, analytics
+from backend.app.models import utcnow
+from backend.app.pagination import encode_cursor
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+
+def user_event_data(db_user: models.User) -> dict:
+    return schemas.UserResponse.model_validate(db_user, from_attributes=True).model_dump(mode="json")
+
+def incident_event_data(db_incident: models.Incident) -> dict:
+    return schemas.IncidentResponse.model_validate(db_incident, from_attributes=True).model_dump(mode="json")
+
+# ========================
+# COLUMN ROWS
+# ========================
+
+# List endpoints select plain columns and hand dicts straight to the JSON encoder,
+# skipping ORM identity-map work and per-row Pydantic validation
+
+def schema_columns(model, schema) -> tuple:
+    # Same names and order as the response schema, so both paths produce the same body
+    return tuple(getattr(model, name) for name in schema.model_fields)
+
+def row_dicts(result) -> list:
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+USER_ROW_COLUMNS = schema_columns(models.User, schemas.UserResponse)
+INCIDENT_ROW_COLUMNS = schema_columns(models.Incident, schemas.IncidentResponse)
 
 # ========================
 # USER CRUD OPERATIONS
@@ -10,18 +45,23 @@ async def get_users(db: AsyncSession):
     result = await db.execute(select(models.User))
     return result.scalars().all()
 
+async def get_user_rows(db: AsyncSession):
+    result = await db.execute(select(*USER_ROW_COLUMNS).order_by(models.User.user_id))
+    return row_dicts(result)
+
 async def create_user(db: AsyncSession, user: schemas.UserCreate):
     user_data = user.model_dump()
     
     if 'password' in user_data:
-        user_data['password_hash'] = auth.hash_password(user_data.pop('password'))
+        user_data['password_hash'] = await auth.hash_password_async(user_data.pop('password'))
     elif 'password_hash' in user_data:
-        user_data['password_hash'] = auth.hash_password(user_data['password_hash'])
+        user_data['password_hash'] = await auth.hash_password_async(user_data['password_hash'])
     
     db_user = models.User(**user_data)
     db.add(db_user)
+    await db.flush()
+    await events.publish(db, "user", "created", db_user.user_id, user_event_data(db_user))
     await db.commit()
-    await db.refresh(db_user)
     return db_user
 
 async def get_user_by_id(db: AsyncSession, user_id: int):
@@ -37,45 +77,62 @@ async def get_user_by_email(db: AsyncSession, email: str):
     return result.scalars().first()
 
 async def update_user(db: AsyncSession, user_id: int, user_data: schemas.UserUpdate):
+    update_data = user_data.model_dump(exclude_unset=True)
+    
+    if "password" in update_data:
+        update_data["password_hash"] = await auth.hash_password_async(update_data.pop("password"))
+    elif "password_hash" in update_data:
+        update_data["password_hash"] = await auth.hash_password_async(update_data["password_hash"])
+    
+    values = {field: value for field, value in update_data.items() if hasattr(models.User, field)}
+    if not values:
+        return await get_user_by_id(db, user_id)
+    
     result = await db.execute(
-        select(models.User).filter(models.User.user_id == user_id)
+        update(models.User)
+        .where(models.User.user_id == user_id)
+        .values(**values)
+        .returning(models.User)
+        .execution_options(synchronize_session=False)
     )
     db_user = result.scalars().first()
     
     if not db_user:
         return None
     
-    update_data = user_data.model_dump(exclude_unset=True)
-    
-    if "password" in update_data:
-        update_data["password_hash"] = auth.hash_password(update_data.pop("password"))
-    elif "password_hash" in update_data:
-        update_data["password_hash"] = auth.hash_password(update_data["password_hash"])
-    
-    for field, value in update_data.items():
-        if hasattr(db_user, field):
-            setattr(db_user, field, value)
-    
+    await events.publish(db, "user", "updated", user_id, user_event_data(db_user))
     await db.commit()
-    await db.refresh(db_user)
+    # Other workers evict their copies when the event reaches their listener
+    cache.invalidate_user_id(user_id, db_user.email)
     return db_user
 
 async def delete_user(db: AsyncSession, user_id: int):
+    # The foreign keys null these columns out; touch the rows so delta sync sends them again
+    await db.execute(
+        update(models.Incident)
+        .where(or_(models.Incident.reporter_id == user_id, models.Incident.resolver_id == user_id))
+        .values(updated_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
     result = await db.execute(
-        select(models.User).filter(models.User.user_id == user_id)
+        delete(models.User)
+        .where(models.User.user_id == user_id)
+        .returning(models.User.email)
     )
-    db_user = result.scalars().first()
+    email = result.scalar()
     
-    if db_user:
-        await db.delete(db_user)
-        await db.commit()
-        return True
+    if email is None:
+        return False
     
-    return False
+    add_tombstone(db, "user", user_id)
+    await events.publish(db, "user", "deleted", user_id, {"user_id": user_id, "email": email})
+    await db.commit()
+    cache.invalidate_user_id(user_id, email)
+    return True
 
 async def authenticate_user(db: AsyncSession, email: str, password: str):
     user = await get_user_by_email(db, email)
-    if not user or not auth.verify_password(password, user.password_hash):
+    if not user or not await auth.verify_password_async(password, user.password_hash):
         return False
     return user
 
@@ -83,55 +140,541 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
 # INCIDENT CRUD OPERATIONS
 # ========================
 
-async def get_incidents(db: AsyncSession):
-    result = await db.execute(select(models.Incident))
-    return result.scalars().all()
+def apply_incident_filters(query, filters: schemas.IncidentFilter):
+    if filters.status_id is not None:
+        query = query.filter(models.Incident.status_id == filters.status_id)
+    if filters.office_id is not None:
+        query = query.filter(models.Incident.office_id == filters.office_id)
+    if filters.reporter_id is not None:
+        query = query.filter(models.Incident.reporter_id == filters.reporter_id)
+    if filters.resolver_id is not None:
+        query = query.filter(models.Incident.resolver_id == filters.resolver_id)
+    if filters.opened_from is not None:
+        query = query.filter(models.Incident.opened_at >= filters.opened_from)
+    if filters.opened_to is not None:
+        query = query.filter(models.Incident.opened_at < filters.opened_to)
+    return query
+
+# Many-to-one relations join into the main query; history adds one IN query for the whole page
+INCIDENT_EXPANSIONS = {
+    "status": joinedload,
+    "reporter": joinedload,
+    "resolver": joinedload,
+    "office": joinedload,
+    "device": joinedload,
+    "history": selectinload,
+}
+
+def parse_expand(value: Optional[str]) -> Tuple[str, ...]:
+    if not value:
+        return ()
+    names = tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in INCIDENT_EXPANSIONS]
+    if unknown:
+        raise ValueError(", ".join(unknown))
+    return names
+
+def incident_load_options(expand: Tuple[str, ...] = (), model=models.Incident):
+    # Archived incidents expose the same relation names, so one table serves both
+    options = [loader(getattr(model, name)) for name, loader in INCIDENT_EXPANSIONS.items() if name in expand]
+    # Relations that were not asked for raise instead of lazy-loading row by row; the
+    # response reads only the requested ones (see main.expanded_incident)
+    return options + [raiseload("*")]
+
+def incident_page_query(query, filters: schemas.IncidentFilter, limit: int, after: Optional[Tuple[datetime, int]]):
+    query = apply_incident_filters(query, filters)
+    
+    if after is not None:
+        query = query.filter(
+            tuple_(models.Incident.opened_at, models.Incident.incident_id) < tuple_(*after)
+        )
+    
+    return query.order_by(
+        models.Incident.opened_at.desc(), models.Incident.incident_id.desc()
+    ).limit(limit + 1)
+
+async def get_incidents(
+    db: AsyncSession,
+    filters: schemas.IncidentFilter,
+    limit: int = 50,
+    after: Optional[Tuple[datetime, int]] = None,
+    expand: Tuple[str, ...] = (),
+):
+    query = select(models.Incident).options(*incident_load_options(expand))
+    result = await db.execute(incident_page_query(query, filters, limit, after))
+    incidents = result.unique().scalars().all()
+    
+    next_cursor = None
+    if len(incidents) > limit:
+        incidents = incidents[:limit]
+        last = incidents[-1]
+        next_cursor = encode_cursor(last.opened_at, last.incident_id)
+    
+    return {"items": incidents, "next_cursor": next_cursor}
+
+async def get_incident_rows(
+    db: AsyncSession,
+    filters: schemas.IncidentFilter,
+    limit: int = 50,
+    after: Optional[Tuple[datetime, int]] = None,
+):
+    result = await db.execute(incident_page_query(select(*INCIDENT_ROW_COLUMNS), filters, limit, after))
+    incidents = row_dicts(result)
+    
+    next_cursor = None
+    if len(incidents) > limit:
+        incidents = incidents[:limit]
+        last = incidents[-1]
+        next_cursor = encode_cursor(last["opened_at"], last["incident_id"])
+    
+    return {"items": incidents, "next_cursor": next_cursor}
 
 async def create_incident(db: AsyncSession, incident: schemas.IncidentCreate):
     incident_data = incident.model_dump()
+    if incident_data.get("opened_at") is None:
+        incident_data["opened_at"] = utcnow()
     db_incident = models.Incident(**incident_data)
     db.add(db_incident)
+    await db.flush()
+    add_incident_history(db, db_incident.incident_id, db_incident.status_id, db_incident.opened_at)
+    await bump_incident_stat(db, await get_incident_stat_key(db, db_incident), 1)
+    await events.publish(db, "incident", "created", db_incident.incident_id, incident_event_data(db_incident))
     await db.commit()
-    await db.refresh(db_incident)
     return db_incident
 
-async def get_incident_by_id(db: AsyncSession, incident_id: int):
-    result = await db.execute(
-        select(models.Incident).filter(models.Incident.incident_id == incident_id)
+async def get_incident_by_id(
+    db: AsyncSession,
+    incident_id: int,
+    expand: Tuple[str, ...] = (),
+    include_archived: bool = False,
+):
+    models_to_check = (models.Incident, models.IncidentArchive) if include_archived else (models.Incident,)
+    for model in models_to_check:
+        result = await db.execute(
+            select(model)
+            .options(*incident_load_options(expand, model))
+            .filter(model.incident_id == incident_id)
+        )
+        db_incident = result.unique().scalars().first()
+        if db_incident is not None:
+            return db_incident
+    return None
+
+def device_type_subquery():
+    # Spelled out: SQLite renders RETURNING columns unqualified, which would turn the
+    # correlation into device_id = device_id and match an arbitrary device
+    return (
+        select(models.Device.type_id)
+        .where(models.Device.device_id == literal_column("incident.device_id"))
+        .scalar_subquery()
     )
-    return result.scalars().first()
 
 async def update_incident(db: AsyncSession, incident_id: int, incident_data: schemas.IncidentUpdate):
-    result = await db.execute(
-        select(models.Incident).filter(models.Incident.incident_id == incident_id)
+    update_data = incident_data.model_dump(exclude_unset=True)
+    comment = update_data.pop("comment", None)
+    values = {field: value for field, value in update_data.items() if hasattr(models.Incident, field)}
+    
+    if not values:
+        return await get_incident_by_id(db, incident_id)
+    
+    # Pre-update status, device type and resolution feed the rollups and the history
+    old = (
+        select(
+            models.Incident.incident_id,
+            models.Incident.status_id,
+            models.Incident.office_id,
+            models.Device.type_id,
+            models.Incident.opened_at,
+            models.Incident.resolved_at,
+        )
+        .outerjoin(models.Device, models.Device.device_id == models.Incident.device_id)
+        .where(models.Incident.incident_id == incident_id)
+        .with_for_update(of=models.Incident)
+    )
+    stmt = (
+        update(models.Incident)
+        .where(models.Incident.incident_id == incident_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
     )
-    db_incident = result.scalars().first()
     
-    if not db_incident:
+    if db.get_bind().dialect.name == "postgresql":
+        # Postgres can return columns of the FROM subquery, i.e. the old row
+        old = old.subquery("old")
+        stmt = stmt.where(models.Incident.incident_id == old.c.incident_id).returning(
+            models.Incident, old.c.status_id, old.c.office_id, old.c.type_id,
+            old.c.opened_at, old.c.resolved_at, device_type_subquery(),
+        )
+        row = (await db.execute(stmt)).first()
+    else:
+        old_row = (await db.execute(old)).first()
+        row = None
+        if old_row is not None:
+            result = await db.execute(stmt.returning(models.Incident, device_type_subquery()))
+            updated = result.first()
+            row = (updated[0], *old_row[1:], updated[1])
+    
+    if row is None:
         return None
     
-    update_data = incident_data.model_dump(exclude_unset=True)
+    db_incident, old_status_id, old_office_id, old_type_id, old_opened_at, old_resolved_at, new_type_id = row
+    old_key = (old_status_id, old_office_id or 0, old_type_id or 0)
+    new_key = (db_incident.status_id, db_incident.office_id or 0, new_type_id or 0)
+    
+    if db_incident.status_id != old_status_id:
+        add_incident_history(db, db_incident.incident_id, db_incident.status_id, utcnow(), comment)
     
-    for field, value in update_data.items():
-        if hasattr(db_incident, field):
-            setattr(db_incident, field, value)
+    analytics.queue_resolution_stats(db, analytics.resolution_change(
+        (old_opened_at, old_resolved_at, old_office_id, old_type_id),
+        (db_incident.opened_at, db_incident.resolved_at, db_incident.office_id, new_type_id),
+    ))
+    if new_key != old_key:
+        await bump_incident_stats(db, Counter({old_key: -1, new_key: 1}))
     
+    await events.publish(db, "incident", "updated", incident_id, incident_event_data(db_incident))
     await db.commit()
-    await db.refresh(db_incident)
     return db_incident
 
 async def delete_incident(db: AsyncSession, incident_id: int):
     result = await db.execute(
-        select(models.Incident).filter(models.Incident.incident_id == incident_id)
+        delete(models.Incident)
+        .where(models.Incident.incident_id == incident_id)
+        .returning(
+            models.Incident.status_id,
+            models.Incident.office_id,
+            device_type_subquery(),
+            models.Incident.reporter_id,
+            models.Incident.opened_at,
+            models.Incident.resolved_at,
+        )
     )
-    db_incident = result.scalars().first()
+    row = result.first()
     
-    if db_incident:
-        await db.delete(db_incident)
+    if row is None:
+        return False
+    
+    status_id, office_id, type_id, reporter_id, opened_at, resolved_at = row
+    # Partitioned history has no foreign key to cascade through
+    await db.execute(delete(models.IncidentHistory).where(models.IncidentHistory.incident_id == incident_id))
+    analytics.queue_resolution_stats(db, analytics.resolution_change(
+        (opened_at, resolved_at, office_id, type_id), (None, None, None, None)
+    ))
+    await bump_incident_stat(db, (status_id, office_id or 0, type_id or 0), -1)
+    add_tombstone(db, "incident", incident_id)
+    await events.publish(db, "incident", "deleted", incident_id, {"incident_id": incident_id, "reporter_id": reporter_id})
+    await db.commit()
+    return True
+
+def add_tombstone(db: AsyncSession, entity: str, entity_id: int):
+    db.add(models.Tombstone(entity=entity, entity_id=entity_id))
+
+# ========================
+# BULK INCIDENT OPERATIONS
+# ========================
+
+def bulk_selection_query(columns, selection: schemas.IncidentBulkSelection, after_id: int, batch_size: int):
+    query = select(*columns)
+    if selection.filters is not None:
+        query = apply_incident_filters(query, selection.filters)
+    if selection.incident_ids is not None:
+        query = query.filter(models.Incident.incident_id.in_(selection.incident_ids))
+    # Keyset on the id, so rows that still match the filter after their update are not revisited
+    return query.filter(models.Incident.incident_id > after_id).order_by(models.Incident.incident_id).limit(batch_size)
+
+async def bulk_update_incidents(
+    db: AsyncSession,
+    changes: schemas.IncidentBulkUpdate,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> List[int]:
+    values = changes.model_dump(include={"status_id", "resolver_id", "resolved_at"}, exclude_unset=True)
+    affected = []
+    after_id = 0
+    
+    while True:
+        # Old status, stats key and resolution of the whole batch, locked until the batch commits
+        old = bulk_selection_query(
+            (
+                models.Incident.incident_id, models.Incident.status_id, models.Incident.office_id,
+                models.Device.type_id, models.Incident.opened_at, models.Incident.resolved_at,
+            ),
+            changes, after_id, batch_size,
+        )
+        old = old.outerjoin(models.Device, models.Device.device_id == models.Incident.device_id)
+        rows = (await db.execute(old.with_for_update(of=models.Incident))).all()
+        if not rows:
+            break
+        incident_ids = [row.incident_id for row in rows]
+        after_id = incident_ids[-1]
+        
+        await db.execute(
+            update(models.Incident)
+            .where(models.Incident.incident_id.in_(incident_ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        
+        now = utcnow()
+        new_status_id = values.get("status_id")
+        changed = [row for row in rows if new_status_id is not None and row.status_id != new_status_id]
+        if changed:
+            await db.execute(insert(models.IncidentHistory), [
+                {"incident_id": row.incident_id, "status_id": new_status_id, "date": now, "comment": changes.comment}
+                for row in changed
+            ])
+            deltas = Counter()
+            for row in changed:
+                deltas[(row.status_id, row.office_id or 0, row.type_id or 0)] -= 1
+                deltas[(new_status_id, row.office_id or 0, row.type_id or 0)] += 1
+            await bump_incident_stats(db, deltas)
+        
+        if "resolved_at" in values:
+            resolutions = {}
+            for row in rows:
+                for sign, resolved_at in ((-1, row.resolved_at), (1, values["resolved_at"])):
+                    analytics.add_resolution(resolutions, row.opened_at, resolved_at, row.office_id, row.type_id, sign)
+            analytics.queue_resolution_stats(db, resolutions)
+        
+        await events.publish(db, "incident", "bulk_updated", None, {"incident_ids": incident_ids})
+        await db.commit()
+        affected += incident_ids
+    
+    return affected
+
+async def bulk_delete_incidents(
+    db: AsyncSession,
+    selection: schemas.IncidentBulkSelection,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> List[int]:
+    affected = []
+    after_id = 0
+    
+    while True:
+        result = await db.execute(bulk_selection_query((models.Incident.incident_id,), selection, after_id, batch_size))
+        candidate_ids = list(result.scalars())
+        if not candidate_ids:
+            break
+        after_id = candidate_ids[-1]
+        
+        result = await db.execute(
+            delete(models.Incident)
+            .where(models.Incident.incident_id.in_(candidate_ids))
+            .returning(
+                models.Incident.incident_id,
+                models.Incident.status_id,
+                models.Incident.office_id,
+                device_type_subquery(),
+                models.Incident.opened_at,
+                models.Incident.resolved_at,
+            )
+        )
+        rows = result.all()
+        if not rows:
+            continue
+        incident_ids = sorted(row[0] for row in rows)
+        
+        await db.execute(delete(models.IncidentHistory).where(models.IncidentHistory.incident_id.in_(incident_ids)))
+        deltas = Counter()
+        resolutions = {}
+        for _, status_id, office_id, type_id, opened_at, resolved_at in rows:
+            deltas[(status_id, office_id or 0, type_id or 0)] -= 1
+            analytics.add_resolution(resolutions, opened_at, resolved_at, office_id, type_id, sign=-1)
+        analytics.queue_resolution_stats(db, resolutions)
+        await bump_incident_stats(db, deltas)
+        now = utcnow()
+        await db.execute(insert(models.Tombstone), [
+            {"entity": "incident", "entity_id": incident_id, "deleted_at": now} for incident_id in incident_ids
+        ])
+        await events.publish(db, "incident", "bulk_deleted", None, {"incident_ids": incident_ids})
         await db.commit()
-        return True
+        affected += incident_ids
+    
+    return affected
+
+# ========================
+# TECHNICIAN WORK QUEUE
+# ========================
+
+QUEUE_STATUS = "open"
+CLAIMED_STATUS = "in_progress"
+
+def status_id_by_name(name: str):
+    return select(models.IncidentStatus.status_id).where(models.IncidentStatus.name == name).scalar_subquery()
+
+def next_queued_incident(office_id: Optional[int] = None):
+    # Equality on status (and office) plus ORDER BY opened_at, incident_id matches a partial
+    # index on the unassigned rows, so the probe reads the first unlocked entry and stops
+    query = select(models.Incident.incident_id).where(
+        models.Incident.status_id == status_id_by_name(QUEUE_STATUS),
+        models.Incident.resolver_id.is_(None),
+    )
+    if office_id is not None:
+        query = query.where(models.Incident.office_id == office_id)
+    return (
+        query.order_by(models.Incident.opened_at, models.Incident.incident_id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+async def claim_next_incident(db: AsyncSession, technician: models.User):
+    # Own office first, then oldest anywhere. SKIP LOCKED lets concurrent claimers pass
+    # over the row another transaction is taking instead of queueing behind its lock
+    probes = [next_queued_incident(technician.office_id)] if technician.office_id is not None else []
+    probes.append(next_queued_incident())
+    for next_incident in probes:
+        result = await db.execute(
+            update(models.Incident)
+            .where(models.Incident.incident_id == next_incident, models.Incident.resolver_id.is_(None))
+            .values(resolver_id=technician.user_id, status_id=status_id_by_name(CLAIMED_STATUS))
+            .returning(models.Incident, device_type_subquery(), status_id_by_name(QUEUE_STATUS))
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is not None:
+            break
+    else:
+        return None
+    
+    db_incident, type_id, queue_status_id = row
+    add_incident_history(db, db_incident.incident_id, db_incident.status_id, utcnow())
+    await events.publish(db, "incident", "updated", db_incident.incident_id, incident_event_data(db_incident))
+    # Last before the commit: claimers from the same office share these rollup rows
+    await bump_incident_stats(db, Counter({
+        (db_incident.status_id, db_incident.office_id or 0, type_id or 0): 1,
+        (queue_status_id, db_incident.office_id or 0, type_id or 0): -1,
+    }))
+    await db.commit()
+    return db_incident
+
+# ========================
+# INCIDENT HISTORY OPERATIONS
+# ========================
+
+def add_incident_history(db: AsyncSession, incident_id: int, status_id: int, date: datetime, comment: Optional[str] = None):
+    db.add(models.IncidentHistory(
+        incident_id=incident_id, status_id=status_id, date=date, comment=comment
+    ))
+
+async def get_incident_history(
+    db: AsyncSession,
+    incident_id: int,
+    limit: int = 50,
+    after: Optional[Tuple[datetime, int]] = None,
+    include_archived: bool = False,
+):
+    page = await read_history_page(db, models.IncidentHistory, incident_id, limit, after)
+    if not page["items"] and include_archived:
+        # Only empty pages pay for the archive lookup
+        archived = await db.execute(
+            select(models.IncidentArchive.incident_id).filter(models.IncidentArchive.incident_id == incident_id)
+        )
+        if archived.scalar() is not None:
+            page = await read_history_page(db, models.IncidentHistoryArchive, incident_id, limit, after)
+    return page
+
+async def read_history_page(
+    db: AsyncSession,
+    model,
+    incident_id: int,
+    limit: int,
+    after: Optional[Tuple[datetime, int]],
+):
+    query = select(*schema_columns(model, schemas.IncidentHistoryResponse)).filter(model.incident_id == incident_id)
     
-    return False
+    if after is not None:
+        query = query.filter(tuple_(model.date, model.history_id) > tuple_(*after))
+    
+    query = query.order_by(model.date, model.history_id).limit(limit + 1)
+    
+    result = await db.execute(query)
+    history = row_dicts(result)
+    
+    next_cursor = None
+    if len(history) > limit:
+        history = history[:limit]
+        last = history[-1]
+        next_cursor = encode_cursor(last["date"], last["history_id"])
+    
+    return {"items": history, "next_cursor": next_cursor}
+
+# ========================
+# INCIDENT STATS OPERATIONS
+# ========================
+
+def upsert(db: AsyncSession, table):
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(table)
+
+async def get_incident_stat_key(db: AsyncSession, db_incident: models.Incident):
+    type_id = 0
+    if db_incident.device_id is not None:
+        result = await db.execute(
+            select(models.Device.type_id).filter(models.Device.device_id == db_incident.device_id)
+        )
+        type_id = result.scalar() or 0
+    return db_incident.status_id, db_incident.office_id or 0, type_id
+
+async def bump_incident_stat(db: AsyncSession, key: Tuple[int, int, int], delta: int):
+    status_id, office_id, type_id = key
+    stmt = upsert(db, models.IncidentStat).values(
+        status_id=status_id, office_id=office_id, type_id=type_id, incident_count=delta
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["status_id", "office_id", "type_id"],
+        set_={"incident_count": models.IncidentStat.incident_count + delta},
+    )
+    await db.execute(stmt)
+
+async def bump_incident_stats(db: AsyncSession, deltas: Counter):
+    # One statement for every key, in a fixed order so concurrent writers lock the
+    # rollup rows in the same sequence
+    rows = [
+        {"status_id": status_id, "office_id": office_id, "type_id": type_id, "incident_count": delta}
+        for (status_id, office_id, type_id), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    stmt = upsert(db, models.IncidentStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["status_id", "office_id", "type_id"],
+        set_={"incident_count": models.IncidentStat.incident_count + stmt.excluded.incident_count},
+    )
+    await db.execute(stmt)
+
+async def get_incident_stats(db: AsyncSession):
+    async def grouped(column):
+        result = await db.execute(
+            select(column, func.sum(models.IncidentStat.incident_count))
+            .group_by(column)
+            .having(func.sum(models.IncidentStat.incident_count) > 0)
+            .order_by(column)
+        )
+        return [{"id": key or None, "count": count} for key, count in result.all()]
+    
+    by_status = await grouped(models.IncidentStat.status_id)
+    return {
+        "total": sum(group["count"] for group in by_status),
+        "by_status": by_status,
+        "by_office": await grouped(models.IncidentStat.office_id),
+        "by_device_type": await grouped(models.IncidentStat.type_id),
+    }
+
+async def rebuild_incident_stats(db: AsyncSession):
+    office_id = func.coalesce(models.Incident.office_id, 0)
+    type_id = func.coalesce(models.Device.type_id, 0)
+    counts = (
+        select(models.Incident.status_id, office_id, type_id, func.count())
+        .outerjoin(models.Device, models.Device.device_id == models.Incident.device_id)
+        .group_by(models.Incident.status_id, office_id, type_id)
+    )
+    await db.execute(delete(models.IncidentStat))
+    await db.execute(
+        insert(models.IncidentStat).from_select(
+            ["status_id", "office_id", "type_id", "incident_count"], counts
+        )
+    )
+    await db.commit()
 
 # ========================
 # REFERENCE DATA OPERATIONS
@@ -1,30 +1,41 @@
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from .database import get_db
 from . import auth
+# Imported through the package path so crud invalidates the same cache instance
+from backend.app.cache import token_cache, user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), 
+    token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ):
-    from . import crud  
-    
-    payload = auth.verify_token(token)
-    email = payload.get("sub")
+    from . import crud
+
+    email = token_cache.get(token)
     if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido",
-        )
-    
-    user = await crud.get_user_by_email(db, email)
+        payload = auth.verify_token(token)
+        email = payload.get("sub")
+        if email is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token inválido",
+            )
+        token_cache.set(token, email, ttl=payload.get("exp", 0) - time.time())
+
+    user = user_cache.get(email)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNACIALIDATED,
-            detail="Usuario no encontrado",
-        )
-    
-    return user
\ No newline at end of file
+        user = await crud.get_user_by_email(db, email)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuario no encontrado",
+            )
+        # Detach the row so a later rollback in this request cannot expire the cached copy
+        db.expunge(user)
+        user_cache.set(email, user)
+
+    return user
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Optional, Set
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from backend.app import cache
+
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "incidens_events")
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+# NOTIFY payloads must stay under 8000 bytes; larger events go out without their data
+NOTIFY_PAYLOAD_LIMIT = 7900
+LISTENER_MAX_BACKOFF = 30.0
+
+# Tells clients they may have missed events and should reload
+RESYNC = {"entity": "resync", "action": "resync", "id": None, "data": None}
+
+logger = logging.getLogger("incidens.events")
+
+# ========================
+# LOCAL SUBSCRIBERS
+# ========================
+
+class Subscriber:
+    def __init__(self, maxsize: int = EVENTS_QUEUE_SIZE):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def put(self, message: dict):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A client that cannot keep up gets a single resync instead of an unbounded backlog
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+subscribers: Set[Subscriber] = set()
+
+def subscribe() -> Subscriber:
+    subscriber = Subscriber()
+    subscribers.add(subscriber)
+    return subscriber
+
+def unsubscribe(subscriber: Subscriber):
+    subscribers.discard(subscriber)
+
+def evict_cached(message: dict):
+    # Runs in every worker, so a user changed through one worker is not served stale by another
+    if message["entity"] == "resync":
+        cache.clear_users()
+    elif message["entity"] == "user" and message["action"] in ("updated", "deleted"):
+        cache.invalidate_user_id(message["id"], (message.get("data") or {}).get("email"))
+
+def dispatch(message: dict):
+    evict_cached(message)
+    for subscriber in list(subscribers):
+        subscriber.put(message)
+
+# ========================
+# PUBLISHING
+# ========================
+
+def encode_payload(message: dict) -> str:
+    payload = json.dumps(message, default=str)
+    if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+        payload = json.dumps(dict(message, data=None))
+    return payload
+
+async def publish(db: AsyncSession, entity: str, action: str, entity_id: Optional[int], data: Optional[dict] = None):
+    # Events ride on the caller's transaction and are only delivered if it commits
+    message = {"entity": entity, "action": action, "id": entity_id, "data": data}
+    if db.get_bind().dialect.name == "postgresql":
+        # NOTIFY is transactional: every worker's listener sees it once the write commits
+        await db.execute(select(func.pg_notify(EVENTS_CHANNEL, encode_payload(message))))
+    else:
+        db.info.setdefault("pending_events", []).append(message)
+
+# Single-process fallback for databases without LISTEN/NOTIFY
+@event.listens_for(Session, "after_commit")
+def dispatch_pending(session):
+    for message in session.info.pop("pending_events", []):
+        dispatch(message)
+
+@event.listens_for(Session, "after_rollback")
+def discard_pending(session):
+    session.info.pop("pending_events", None)
+
+# ========================
+# POSTGRES LISTENER
+# ========================
+
+listener_task: Optional[asyncio.Task] = None
+
+def on_notify(connection, pid, channel, payload):
+    try:
+        dispatch(json.loads(payload))
+    except ValueError:
+        logger.warning("Discarding malformed event payload on %s", channel)
+
+async def listen(url: str):
+    import asyncpg
+
+    dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+    backoff = 1.0
+    connected_before = False
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(EVENTS_CHANNEL, on_notify)
+            if connected_before:
+                # Notifications sent while we were disconnected are gone
+                dispatch(RESYNC)
+            connected_before = True
+            backoff = 1.0
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    # An idle LISTEN connection can die silently; a ping surfaces it
+                    await connection.execute("SELECT 1")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Event listener disconnected: %s", e)
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, LISTENER_MAX_BACKOFF)
+
+def start_listener(engine):
+    global listener_task
+    if engine.dialect.name == "postgresql" and listener_task is None:
+        listener_task = asyncio.create_task(listen(engine.url.render_as_string(hide_password=False)))
+
+async def stop_listener():
+    global listener_task
+    if listener_task is not None:
+        listener_task.cancel()
+        try:
+            await listener_task
+        except asyncio.CancelledError:
+            pass
+        listener_task = None
+
+# ========================
+# SERVER-SENT EVENTS
+# ========================
+
+def is_visible(message: dict, user) -> bool:
+    entity = message["entity"]
+    if entity == "resync" or user.role_id == 1:
+        return True
+    if entity == "incident":
+        # Regular users only follow the incidents they reported; coarse events (bulk,
+        # imported, archived) carry no reporter and may cover anyone's incidents
+        data = message.get("data") or {}
+        return user.role_id == 2 or data.get("reporter_id") == user.user_id
+    return False
+
+def format_sse(message: dict) -> str:
+    return f"event: {message['entity']}\ndata: {json.dumps(message, default=str)}\n\n"
+
+async def event_stream(user):
+    subscriber = subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), EVENTS_HEARTBEAT)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            if is_visible(message, user):
+                yield format_sse(message)
+    finally:
+        unsubscribe(subscriber)
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+from sqlalchemy.future import select
+from backend.app import models, schemas, crud, database
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+EXPORT_CHUNK_ROWS = 1000
+
+INCIDENT_EXPORT_COLUMNS = (
+    models.Incident.incident_id,
+    models.Incident.opened_at,
+    models.Incident.status_id,
+    models.Incident.description,
+    models.Incident.reporter_id,
+    models.Incident.resolver_id,
+    models.Incident.office_id,
+    models.Incident.device_id,
+    models.Incident.resolved_at,
+)
+
+HISTORY_EXPORT_COLUMNS = (
+    models.IncidentHistory.history_id,
+    models.IncidentHistory.incident_id,
+    models.IncidentHistory.status_id,
+    models.IncidentHistory.date,
+    models.IncidentHistory.comment,
+)
+
+# ========================
+# ROW ENCODERS
+# ========================
+
+def encode_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def encode_csv(names: Sequence[str], rows, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(names)
+    writer.writerows([encode_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+def encode_ndjson(names: Sequence[str], rows, header: bool) -> str:
+    return "".join(
+        json.dumps({name: encode_value(value) for name, value in zip(names, row)}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson}
+
+# ========================
+# STREAMING EXPORTS
+# ========================
+
+async def stream_rows(query, names: Sequence[str], fmt: str, session_factory=None) -> AsyncIterator[bytes]:
+    encode = ENCODERS[fmt]
+    header = True
+    # The stream outlives the request's dependency-managed session, so it owns one
+    async with (session_factory or database.AsyncSessionLocal)() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+        async for rows in result.partitions(EXPORT_CHUNK_ROWS):
+            yield encode(names, rows, header).encode()
+            header = False
+    if header and fmt == "csv":
+        yield encode(names, [], True).encode()
+
+def export_incidents(filters: schemas.IncidentFilter, fmt: str, session_factory=None) -> AsyncIterator[bytes]:
+    query = crud.apply_incident_filters(select(*INCIDENT_EXPORT_COLUMNS), filters)
+    query = query.order_by(models.Incident.incident_id)
+    names = [column.key for column in INCIDENT_EXPORT_COLUMNS]
+    return stream_rows(query, names, fmt, session_factory)
+
+def export_incident_history(filters: schemas.IncidentFilter, fmt: str, session_factory=None) -> AsyncIterator[bytes]:
+    query = select(*HISTORY_EXPORT_COLUMNS).join(
+        models.Incident, models.Incident.incident_id == models.IncidentHistory.incident_id
+    )
+    query = crud.apply_incident_filters(query, filters)
+    query = query.order_by(models.IncidentHistory.history_id)
+    names = [column.key for column in HISTORY_EXPORT_COLUMNS]
+    return stream_rows(query, names, fmt, session_factory)
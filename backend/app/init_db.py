@@ -1,13 +1,73 @@
 import asyncio
-from .database import AsyncSessionLocal, engine, Base
-from sqlalchemy import select 
+from functools import lru_cache
+from pathlib import Path
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from .database import AsyncSessionLocal, DATABASE_URL, engine
 from . import models
 
-async def init_db():
-    
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+# Databases built by create_all before the migrations existed are adopted at this revision
+INITIAL_REVISION = "0001"
+
+# ========================
+# SCHEMA VERSION
+# ========================
+
+def alembic_config():
+    from alembic.config import Config
+    return Config(str(ALEMBIC_INI))
+
+@lru_cache(maxsize=None)
+def head_revision() -> str:
+    # Parses the migration scripts, so once per process
+    from alembic.script import ScriptDirectory
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+async def current_revision(bind=engine):
+    async with bind.connect() as conn:
+        try:
+            return (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        except DBAPIError:
+            return None
+
+async def check_schema_version(bind=engine) -> str:
+    # Every worker start pays one SELECT here instead of create_all's catalog round trips
+    current, head = await current_revision(bind), head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"El esquema está en la revisión {current or 'ninguna'} y la aplicación espera {head}. "
+            "Ejecuta: python scripts/manage.py migrate"
+        )
+    return current
+
+async def schema_state():
+    # Own engine: Alembic runs its own event loop, so pooled connections cannot be shared
+    probe = create_async_engine(DATABASE_URL)
+    try:
+        current = await current_revision(probe)
+        async with probe.connect() as conn:
+            has_tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("incident"))
+    finally:
+        await probe.dispose()
+    return current, has_tables
+
+def upgrade_schema(revision: str = "head"):
+    from alembic import command
+
+    config = alembic_config()
+    current, has_tables = asyncio.run(schema_state())
+    if current is None and has_tables:
+        print(f"Base de datos sin versionar: se marca como revisión {INITIAL_REVISION} antes de migrar")
+        command.stamp(config, INITIAL_REVISION)
+    command.upgrade(config, revision)
+
+# ========================
+# REFERENCE DATA
+# ========================
+
+async def seed_reference_data():
     async with AsyncSessionLocal() as db:
         
         result = await db.execute(select(models.UserRole))
@@ -44,6 +104,3 @@ async def init_db():
         
         await db.commit()
         print("✅ Datos iniciales insertados correctamente")
-
-if __name__ == "__main__":
-    asyncio.run(init_db())
\ No newline at end of file
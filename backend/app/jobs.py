@@ -0,0 +1,328 @@
+import asyncio
+import logging
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from sqlalchemy import delete, event, func, inspect, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+from backend.app import models
+from backend.app.metrics import Histogram, histogram_lines
+from backend.app.models import utcnow
+
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "4"))
+JOBS_QUEUE_SIZE = int(os.getenv("JOBS_QUEUE_SIZE", "1000"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "5"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "8"))
+# How long a claimed job stays invisible to other workers before it is retried
+JOBS_LEASE = float(os.getenv("JOBS_LEASE", "60"))
+JOBS_DRAIN_TIMEOUT = float(os.getenv("JOBS_DRAIN_TIMEOUT", "10"))
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 600.0
+LAG_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+logger = logging.getLogger("incidens.jobs")
+
+# ========================
+# HANDLERS
+# ========================
+
+# Handlers run in their own session; their writes commit together with the removal of
+# the job from the outbox, so a job that touches only the database takes effect once
+Handler = Callable[[AsyncSession, object], Awaitable[None]]
+handlers: Dict[str, Handler] = {}
+
+def handler(name: str):
+    def register(function: Handler) -> Handler:
+        handlers[name] = function
+        return function
+    return register
+
+# ========================
+# ENQUEUEING
+# ========================
+
+def enqueue(db: AsyncSession, name: str, payload) -> models.OutboxJob:
+    # The outbox row rides on the caller's transaction; workers hear about it after the commit
+    job = models.OutboxJob(name=name, payload=payload)
+    db.add(job)
+    db.info.setdefault("pending_jobs", []).append(job)
+    return job
+
+@event.listens_for(Session, "after_commit")
+def submit_pending(session):
+    for job in session.info.pop("pending_jobs", []):
+        identity = inspect(job).identity
+        if identity is not None:
+            submit(identity[0])
+
+@event.listens_for(Session, "after_rollback")
+def discard_pending(session):
+    session.info.pop("pending_jobs", None)
+
+# ========================
+# METRICS
+# ========================
+
+@dataclass
+class JobStats:
+    completed: int = 0
+    retried: int = 0
+    failed: int = 0
+    # Commits whose wake-up did not fit in the queue; the poller finds those jobs later
+    overflowed: int = 0
+    # Jobs that outran JOBS_LEASE and were taken over before they could finish
+    lost_leases: int = 0
+    # Time from a job becoming due to a worker picking it up
+    lag: Histogram = field(default_factory=lambda: Histogram(LAG_BUCKETS))
+    outbox_pending: int = 0
+    outbox_failed: int = 0
+    oldest_due_seconds: float = 0.0
+
+stats = JobStats()
+
+# ========================
+# EXECUTION
+# ========================
+
+def retry_delay(attempts: int) -> float:
+    delay = min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+    # Jitter keeps jobs that failed together from retrying in lockstep
+    return delay * random.uniform(0.75, 1.0)
+
+def is_due(now):
+    job = models.OutboxJob
+    return (
+        job.failed_at.is_(None),
+        job.run_after <= now,
+        or_(job.locked_until.is_(None), job.locked_until < now),
+    )
+
+async def fetch_due(db: AsyncSession, limit: int) -> List[int]:
+    job = models.OutboxJob
+    result = await db.execute(
+        select(job.job_id).filter(*is_due(utcnow())).order_by(job.run_after, job.job_id).limit(limit)
+    )
+    return list(result.scalars())
+
+async def claim(db: AsyncSession, job_id: int):
+    # Atomic: of all the workers and processes that see the job, one takes the lease
+    now = utcnow()
+    job = models.OutboxJob
+    result = await db.execute(
+        update(job)
+        .where(job.job_id == job_id, *is_due(now))
+        .values(locked_until=now + timedelta(seconds=JOBS_LEASE), attempts=job.attempts + 1)
+        .returning(job.name, job.payload, job.attempts, job.run_after, job.locked_until)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.first()
+    await db.commit()
+    return row
+
+def holds_lease(job_id: int, lease):
+    # A worker whose lease expired may have lost the job to another worker, or to a
+    # rebuild that absorbed it; then its outcome must not be written
+    return models.OutboxJob.job_id == job_id, models.OutboxJob.locked_until == lease
+
+async def release(db: AsyncSession, job_id: int, lease, attempts: int, error: Exception):
+    now = utcnow()
+    values = {"locked_until": None, "last_error": repr(error)[:2000]}
+    if attempts >= JOBS_MAX_ATTEMPTS:
+        values["failed_at"] = now
+        stats.failed += 1
+        logger.error("Job %s failed for good after %d attempts: %r", job_id, attempts, error)
+    else:
+        delay = retry_delay(attempts)
+        values["run_after"] = now + timedelta(seconds=delay)
+        stats.retried += 1
+        logger.warning("Job %s failed (attempt %d), retrying in %.1f s: %r", job_id, attempts, delay, error)
+    await db.execute(update(models.OutboxJob).where(*holds_lease(job_id, lease)).values(**values))
+    await db.commit()
+
+async def run_job(session_factory, job_id: int) -> bool:
+    async with session_factory() as db:
+        row = await claim(db, job_id)
+        if row is None:
+            # Already done, leased by another worker or backing off
+            return False
+        name, payload, attempts, run_after, lease = row
+        stats.lag.observe(max((utcnow() - run_after).total_seconds(), 0.0))
+        try:
+            if name not in handlers:
+                raise LookupError(f"No handler registered for job {name!r}")
+            await handlers[name](db, payload)
+            result = await db.execute(delete(models.OutboxJob).where(*holds_lease(job_id, lease)))
+            if result.rowcount == 0:
+                await db.rollback()
+                stats.lost_leases += 1
+                logger.warning("Job %s lost its lease before finishing; its writes were rolled back", job_id)
+                return False
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            await release(db, job_id, lease, attempts, e)
+            return False
+    stats.completed += 1
+    return True
+
+async def run_due_jobs(session_factory, limit: int = 1000) -> int:
+    # One pass over the outbox without the worker pool, for scripts and maintenance
+    async with session_factory() as db:
+        job_ids = await fetch_due(db, limit)
+    completed = 0
+    for job_id in job_ids:
+        completed += await run_job(session_factory, job_id)
+    return completed
+
+async def retry_failed_jobs(db: AsyncSession) -> int:
+    result = await db.execute(
+        update(models.OutboxJob)
+        .where(models.OutboxJob.failed_at.isnot(None))
+        .values(failed_at=None, attempts=0, run_after=utcnow())
+    )
+    await db.commit()
+    return result.rowcount
+
+# ========================
+# WORKER POOL
+# ========================
+
+class WorkerPool:
+    def __init__(self, session_factory, maxsize: int):
+        self.session_factory = session_factory
+        # Bounded: a burst of commits waits in the outbox rather than in memory
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.queued: Set[int] = set()
+        self.tasks: List[asyncio.Task] = []
+        self.poller: Optional[asyncio.Task] = None
+        self.stopping = asyncio.Event()
+
+    def put(self, job_id: int) -> bool:
+        if job_id in self.queued:
+            return True
+        try:
+            self.queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            return False
+        self.queued.add(job_id)
+        return True
+
+pool: Optional[WorkerPool] = None
+
+def submit(job_id: int):
+    if pool is not None and not pool.put(job_id):
+        stats.overflowed += 1
+
+async def worker(pool: WorkerPool):
+    while True:
+        job_id = await pool.queue.get()
+        try:
+            await run_job(pool.session_factory, job_id)
+        except Exception:
+            # The database itself is failing; the job stays in the outbox for the poller
+            logger.exception("Job %s could not be run", job_id)
+        finally:
+            pool.queued.discard(job_id)
+            pool.queue.task_done()
+
+async def refresh_outbox_stats(db: AsyncSession):
+    job = models.OutboxJob
+    now = utcnow()
+    pending, oldest_due = (await db.execute(
+        select(func.count(), func.min(job.run_after)).filter(job.failed_at.is_(None))
+    )).one()
+    stats.outbox_pending = pending
+    stats.oldest_due_seconds = max((now - oldest_due).total_seconds(), 0.0) if oldest_due else 0.0
+    stats.outbox_failed = await db.scalar(select(func.count()).select_from(job).filter(job.failed_at.isnot(None)))
+
+async def poll(pool: WorkerPool):
+    # Picks up what the post-commit hook could not deliver: jobs from before a restart,
+    # from other processes, past a full queue, or due for a retry
+    while not pool.stopping.is_set():
+        try:
+            async with pool.session_factory() as db:
+                free = pool.queue.maxsize - pool.queue.qsize()
+                if free > 0:
+                    for job_id in await fetch_due(db, free):
+                        pool.put(job_id)
+                await refresh_outbox_stats(db)
+        except Exception as e:
+            logger.warning("Job outbox poll failed: %s", e)
+        try:
+            await asyncio.wait_for(pool.stopping.wait(), JOBS_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+def start_workers(session_factory, workers: int = JOBS_WORKERS):
+    global pool
+    if pool is None:
+        pool = WorkerPool(session_factory, JOBS_QUEUE_SIZE)
+        pool.tasks = [asyncio.create_task(worker(pool)) for _ in range(workers)]
+        pool.poller = asyncio.create_task(poll(pool))
+
+async def stop_workers(timeout: float = JOBS_DRAIN_TIMEOUT):
+    global pool
+    if pool is None:
+        return
+    current, pool = pool, None
+    # Not cancelled mid-query: the poller finishes its pass and stops
+    current.stopping.set()
+    await current.poller
+    try:
+        # Let queued jobs finish; anything left over is still in the outbox for the next start
+        await asyncio.wait_for(current.queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Stopped with %d jobs queued; they will run after the next start", current.queue.qsize())
+    for task in current.tasks:
+        task.cancel()
+    await asyncio.gather(*current.tasks, return_exceptions=True)
+
+# ========================
+# REPORTING
+# ========================
+
+def jobs_stats() -> dict:
+    return {
+        "workers": len(pool.tasks) if pool else 0,
+        "queue_depth": pool.queue.qsize() if pool else 0,
+        "queue_size": pool.queue.maxsize if pool else JOBS_QUEUE_SIZE,
+        "outbox_pending": stats.outbox_pending,
+        "outbox_failed": stats.outbox_failed,
+        "oldest_due_seconds": round(stats.oldest_due_seconds, 3),
+        "completed": stats.completed,
+        "retried": stats.retried,
+        "failed": stats.failed,
+        "overflowed": stats.overflowed,
+        "lost_leases": stats.lost_leases,
+        "lag_avg_ms": round(stats.lag.total / stats.lag.count * 1000, 3) if stats.lag.count else 0.0,
+    }
+
+def render_prometheus() -> str:
+    lines = [
+        "# HELP incidens_jobs_queue_depth Jobs waiting in the in-process queue",
+        "# TYPE incidens_jobs_queue_depth gauge",
+        f"incidens_jobs_queue_depth {pool.queue.qsize() if pool else 0}",
+        "# HELP incidens_jobs_outbox_pending Jobs in the outbox not yet done, as of the last poll",
+        "# TYPE incidens_jobs_outbox_pending gauge",
+        f"incidens_jobs_outbox_pending {stats.outbox_pending}",
+        "# HELP incidens_jobs_outbox_failed Jobs that exhausted their retries",
+        "# TYPE incidens_jobs_outbox_failed gauge",
+        f"incidens_jobs_outbox_failed {stats.outbox_failed}",
+        "# HELP incidens_jobs_oldest_due_seconds Age of the oldest job waiting in the outbox",
+        "# TYPE incidens_jobs_oldest_due_seconds gauge",
+        f"incidens_jobs_oldest_due_seconds {stats.oldest_due_seconds}",
+        "# HELP incidens_jobs_total Jobs by outcome",
+        "# TYPE incidens_jobs_total counter",
+    ]
+    for outcome in ("completed", "retried", "failed", "overflowed", "lost_leases"):
+        lines.append(f'incidens_jobs_total{{outcome="{outcome}"}} {getattr(stats, outcome)}')
+    lines += [
+        "# HELP incidens_jobs_lag_seconds Time from a job becoming due to a worker starting it",
+        "# TYPE incidens_jobs_lag_seconds histogram",
+    ]
+    lines += histogram_lines("incidens_jobs_lag_seconds", stats.lag, 'queue="default"')
+    return "\n".join(lines) + "\n"
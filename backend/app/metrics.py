@@ -0,0 +1,183 @@
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+SLOW_REQUEST_MAX_STATEMENTS = 50
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+logger = logging.getLogger("incidens.slow_requests")
+
+# ========================
+# PER-REQUEST STATE
+# ========================
+
+@dataclass
+class RequestStats:
+    query_count: int = 0
+    db_time: float = 0.0
+    statements: Optional[List[str]] = None
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+# ========================
+# METRIC TYPES
+# ========================
+
+@dataclass
+class Histogram:
+    buckets: tuple
+    counts: List[int] = None
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+@dataclass
+class RouteMetrics:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    queries: Histogram = field(default_factory=lambda: Histogram(QUERY_COUNT_BUCKETS))
+    db_time: float = 0.0
+    responses: dict = field(default_factory=dict)
+
+routes: dict = {}
+
+def record_request(method: str, route: str, status: int, duration: float, stats: RequestStats, streaming: bool = False):
+    metrics = routes.get((method, route))
+    if metrics is None:
+        metrics = routes[(method, route)] = RouteMetrics()
+    metrics.queries.observe(stats.query_count)
+    metrics.db_time += stats.db_time
+    metrics.responses[status] = metrics.responses.get(status, 0) + 1
+    if streaming:
+        # An event stream lasts as long as the client stays connected; its duration
+        # would only push the route's latency into the top bucket
+        return
+    metrics.latency.observe(duration)
+
+    if SLOW_REQUEST_MS and duration * 1000 >= SLOW_REQUEST_MS:
+        logger.warning(
+            "Slow request %s %s: %.1f ms, %d queries, %.1f ms in DB\n%s",
+            method, route, duration * 1000, stats.query_count, stats.db_time * 1000,
+            "\n".join(stats.statements or []),
+        )
+
+# ========================
+# SQLALCHEMY HOOKS
+# ========================
+
+# Registered on the Engine class so every engine in the process is covered
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is None or not conn.info.get("query_started"):
+        return
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats.query_count += 1
+    stats.db_time += elapsed
+    if stats.statements is not None and len(stats.statements) < SLOW_REQUEST_MAX_STATEMENTS:
+        stats.statements.append(f"[{elapsed * 1000:.1f} ms] {statement}")
+
+@event.listens_for(Engine, "handle_error")
+def handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+# ========================
+# ASGI MIDDLEWARE
+# ========================
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(statements=[] if SLOW_REQUEST_MS else None)
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                streaming = any(
+                    name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in message.get("headers", [])
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            route = scope.get("route")
+            # Unmatched paths are folded together so scanners cannot blow up the label set
+            route_path = getattr(route, "path", "<unmatched>")
+            record_request(scope["method"], route_path, status_code, time.perf_counter() - started, stats, streaming)
+
+# ========================
+# PROMETHEUS EXPOSITION
+# ========================
+
+def label_text(**labels) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+def histogram_lines(name: str, histogram: Histogram, labels: str) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+def render_prometheus() -> str:
+    latency = [
+        "# HELP incidens_request_duration_seconds Request latency by route",
+        "# TYPE incidens_request_duration_seconds histogram",
+    ]
+    queries = [
+        "# HELP incidens_request_db_queries Database queries issued per request",
+        "# TYPE incidens_request_db_queries histogram",
+    ]
+    db_time = [
+        "# HELP incidens_request_db_seconds_total Time spent in database calls",
+        "# TYPE incidens_request_db_seconds_total counter",
+    ]
+    responses = [
+        "# HELP incidens_responses_total Responses by route and status code",
+        "# TYPE incidens_responses_total counter",
+    ]
+    for (method, route), metrics in sorted(routes.items()):
+        labels = label_text(method=method, route=route)
+        latency += histogram_lines("incidens_request_duration_seconds", metrics.latency, labels)
+        queries += histogram_lines("incidens_request_db_queries", metrics.queries, labels)
+        db_time.append(f"incidens_request_db_seconds_total{{{labels}}} {metrics.db_time}")
+        for status_code, count in sorted(metrics.responses.items()):
+            responses.append(f"incidens_responses_total{{{labels},status=\"{status_code}\"}} {count}")
+    return "\n".join(latency + queries + db_time + responses) + "\n"
@@ -1,8 +1,55 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, TIMESTAMP
+import os
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Text, TIMESTAMP, Date, Float, JSON, Index, DDL, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import relationship
 
 from backend.app.database import Base
-from .database import Base
+from .database import Base, DATABASE_URL
+
+# Postgres only: range-partition incident by opened_at and incident_history by date.
+# Takes effect when the tables are created; scripts/maintain_partitions.py adds the
+# monthly partitions. Partition keys must be part of every unique constraint, so in
+# this mode the primary keys gain the timestamp and incident_history loses its
+# foreign key to incident (deletes clean up history explicitly).
+INCIDENT_PARTITIONING = (
+    os.getenv("INCIDENT_PARTITIONING", "false").lower() in ("1", "true", "yes")
+    and make_url(DATABASE_URL).get_backend_name() == "postgresql"
+)
+
+
+def utcnow() -> datetime:
+    # Columns are TIMESTAMP WITHOUT TIME ZONE, stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class next_change_seq(FunctionElement):
+    """Delta sync position of a write, evaluated by the database inside the writing transaction."""
+
+    type = BigInteger()
+    inherit_cache = True
+    _traverse_internals = FunctionElement._traverse_internals + [("table_name", InternalTraversal.dp_string)]
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        super().__init__()
+
+
+@compiles(next_change_seq)
+def compile_next_change_seq(element, compiler, **kw):
+    # SQLite has a single writer holding the database lock until commit, so one past
+    # the highest committed value follows commit order
+    return f'(SELECT COALESCE(MAX(change_seq), 0) + 1 FROM "{element.table_name}")'
+
+
+@compiles(next_change_seq, "postgresql")
+def compile_next_change_seq_postgresql(element, compiler, **kw):
+    # The writing transaction's id; readers stop below the oldest transaction still
+    # running (see sync.change_fence), so a late commit is never skipped
+    return "pg_current_xact_id()::text::bigint"
 
 
 # ========================
@@ -62,6 +109,8 @@ class User(Base):
     email = Column(String(150), unique=True, nullable=False, index=True)
     password_hash = Column(Text, nullable=False)
     role_id = Column(Integer, ForeignKey("user_role.role_id"), nullable=False)
+    updated_at = Column(TIMESTAMP, nullable=False, default=utcnow, onupdate=utcnow)
+    change_seq = Column(BigInteger, nullable=False, default=next_change_seq("user"), onupdate=next_change_seq("user"))
 
     office = relationship("Office", back_populates="users")
     role = relationship("UserRole", back_populates="users")
@@ -69,6 +118,11 @@ class User(Base):
     reported_incidents = relationship("Incident", foreign_keys="[Incident.reporter_id]", back_populates="reporter")
     resolved_incidents = relationship("Incident", foreign_keys="[Incident.resolver_id]", back_populates="resolver")
 
+    # Delta sync, keyset on (change_seq, user_id)
+    __table_args__ = (
+        Index("ix_user_change_seq_id", "change_seq", "user_id"),
+    )
+
 
 class Device(Base):
     __tablename__ = "device"
@@ -87,8 +141,8 @@ class Device(Base):
 class Incident(Base):
     __tablename__ = "incident"
 
-    incident_id = Column(Integer, primary_key=True, index=True)
-    opened_at = Column(TIMESTAMP, nullable=False)
+    incident_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    opened_at = Column(TIMESTAMP, nullable=False, primary_key=INCIDENT_PARTITIONING)
     status_id = Column(Integer, ForeignKey("incident_status.status_id"), nullable=False)
     description = Column(Text, nullable=False)
     reporter_id = Column(Integer, ForeignKey("user.user_id", ondelete="SET NULL"))
@@ -96,13 +150,77 @@ class Incident(Base):
     office_id = Column(Integer, ForeignKey("office.office_id", ondelete="CASCADE"))
     device_id = Column(Integer, ForeignKey("device.device_id", ondelete="SET NULL"))
     resolved_at = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP, nullable=False, default=utcnow, onupdate=utcnow)
+    change_seq = Column(BigInteger, nullable=False, default=next_change_seq("incident"), onupdate=next_change_seq("incident"))
 
     status = relationship("IncidentStatus", back_populates="incidents")
     reporter = relationship("User", foreign_keys=[reporter_id], back_populates="reported_incidents")
     resolver = relationship("User", foreign_keys=[resolver_id], back_populates="resolved_incidents")
     office = relationship("Office", back_populates="incidents")
     device = relationship("Device", back_populates="incidents")
-    history = relationship("IncidentHistory", back_populates="incident", cascade="all, delete")
+    history = relationship(
+        "IncidentHistory",
+        primaryjoin="Incident.incident_id == foreign(IncidentHistory.incident_id)",
+        back_populates="incident",
+        cascade="all, delete",
+        order_by="(IncidentHistory.date, IncidentHistory.history_id)",
+    )
+
+    # Identity stays incident_id even when the table key includes opened_at
+    __mapper_args__ = {"primary_key": [incident_id]}
+
+    # Keyset pagination on (opened_at, incident_id), optionally narrowed by one filter column
+    __table_args__ = (
+        Index("ix_incident_opened_at_id", "opened_at", "incident_id"),
+        Index("ix_incident_status_opened_at_id", "status_id", "opened_at", "incident_id"),
+        Index("ix_incident_office_opened_at_id", "office_id", "opened_at", "incident_id"),
+        Index("ix_incident_reporter_opened_at_id", "reporter_id", "opened_at", "incident_id"),
+        Index("ix_incident_resolver_opened_at_id", "resolver_id", "opened_at", "incident_id"),
+        # Delta sync, keyset on (change_seq, incident_id)
+        Index("ix_incident_change_seq_id", "change_seq", "incident_id"),
+        # Work queue: only the unassigned incidents, oldest first, in a technician's own
+        # office and anywhere
+        Index(
+            "ix_incident_unassigned_status_office_opened_at_id", "status_id", "office_id", "opened_at", "incident_id",
+            postgresql_where=resolver_id.is_(None), sqlite_where=resolver_id.is_(None),
+        ),
+        Index(
+            "ix_incident_unassigned_opened_at_id", "opened_at", "incident_id",
+            postgresql_where=resolver_id.is_(None), sqlite_where=resolver_id.is_(None),
+        ),
+        {"postgresql_partition_by": "RANGE (opened_at)"} if INCIDENT_PARTITIONING else {},
+    )
+
+
+# ========================
+# INCIDENT FULL-TEXT SEARCH
+# ========================
+
+# Postgres: generated tsvector column + GIN index. SQLite: external-content FTS5 table
+# kept in sync by triggers. Neither is mapped, so the ORM model stays dialect-neutral.
+SEARCH_LANGUAGE = "spanish"
+
+for statement in (
+    f"ALTER TABLE incident ADD COLUMN search_vector tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_LANGUAGE}', description)) STORED",
+    "CREATE INDEX ix_incident_search_vector ON incident USING GIN (search_vector)",
+):
+    event.listen(Incident.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+for statement in (
+    "CREATE VIRTUAL TABLE incident_fts USING fts5(description, content='incident', content_rowid='incident_id')",
+    "CREATE TRIGGER incident_fts_insert AFTER INSERT ON incident BEGIN "
+    "INSERT INTO incident_fts(rowid, description) VALUES (new.incident_id, new.description); END",
+    "CREATE TRIGGER incident_fts_delete AFTER DELETE ON incident BEGIN "
+    "INSERT INTO incident_fts(incident_fts, rowid, description) VALUES ('delete', old.incident_id, old.description); END",
+    "CREATE TRIGGER incident_fts_update AFTER UPDATE OF description ON incident BEGIN "
+    "INSERT INTO incident_fts(incident_fts, rowid, description) VALUES ('delete', old.incident_id, old.description); "
+    "INSERT INTO incident_fts(rowid, description) VALUES (new.incident_id, new.description); END",
+):
+    event.listen(Incident.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+# The FTS5 table is not in the metadata, so drop_all would leave it behind
+event.listen(Incident.__table__, "after_drop", DDL("DROP TABLE IF EXISTS incident_fts").execute_if(dialect="sqlite"))
 
 
 # ========================
@@ -112,11 +230,160 @@ class Incident(Base):
 class IncidentHistory(Base):
     __tablename__ = "incident_history"
 
-    history_id = Column(Integer, primary_key=True, index=True)
-    incident_id = Column(Integer, ForeignKey("incident.incident_id", ondelete="CASCADE"))
+    history_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    incident_id = Column(
+        Integer,
+        *(() if INCIDENT_PARTITIONING else (ForeignKey("incident.incident_id", ondelete="CASCADE"),))
+    )
+    status_id = Column(Integer, ForeignKey("incident_status.status_id"), nullable=False)
+    date = Column(TIMESTAMP, nullable=False, primary_key=INCIDENT_PARTITIONING)
+    comment = Column(Text)
+
+    incident = relationship(
+        "Incident",
+        primaryjoin="Incident.incident_id == foreign(IncidentHistory.incident_id)",
+        back_populates="history",
+    )
+    status = relationship("IncidentStatus", back_populates="history")
+
+    __mapper_args__ = {"primary_key": [history_id]}
+
+    # Per-incident timeline pages, keyset on (date, history_id)
+    __table_args__ = (
+        Index("ix_incident_history_incident_date_id", "incident_id", "date", "history_id"),
+        {"postgresql_partition_by": "RANGE (date)"} if INCIDENT_PARTITIONING else {},
+    )
+
+# Rows outside every monthly partition land here until maintenance creates their month
+for partitioned in (Incident.__table__, IncidentHistory.__table__):
+    event.listen(
+        partitioned,
+        "after_create",
+        DDL(f"CREATE TABLE {partitioned.name}_default PARTITION OF {partitioned.name} DEFAULT").execute_if(
+            dialect="postgresql", callable_=lambda *args, **kwargs: INCIDENT_PARTITIONING
+        ),
+    )
+
+# ========================
+# INCIDENT STATS ROLLUP
+# ========================
+
+class IncidentStat(Base):
+    __tablename__ = "incident_stat"
+
+    # 0 stands for "no office" / "no device" so every key column can be part of the primary key
+    status_id = Column(Integer, primary_key=True)
+    office_id = Column(Integer, primary_key=True)
+    type_id = Column(Integer, primary_key=True)
+    incident_count = Column(Integer, nullable=False, default=0)
+
+
+class ResolutionStat(Base):
+    __tablename__ = "resolution_stat"
+
+    # One row per resolution day, office, device type and sketch bin; merging any date
+    # range is a SUM grouped by bin. See backend/app/analytics.py
+    day = Column(Date, primary_key=True)
+    office_id = Column(Integer, primary_key=True)
+    type_id = Column(Integer, primary_key=True)
+    bin = Column(Integer, primary_key=True)
+    resolved_count = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0)
+
+
+# ========================
+# DELETION TOMBSTONES
+# ========================
+
+class Tombstone(Base):
+    __tablename__ = "tombstone"
+
+    # Deleted rows are gone, so delta sync needs a record of what disappeared and when
+    tombstone_id = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(TIMESTAMP, nullable=False, default=utcnow)
+    change_seq = Column(BigInteger, nullable=False, default=next_change_seq("tombstone"))
+
+    __table_args__ = (
+        Index("ix_tombstone_change_seq_id", "change_seq", "tombstone_id"),
+    )
+
+
+# ========================
+# BACKGROUND JOB OUTBOX
+# ========================
+
+class OutboxJob(Base):
+    __tablename__ = "job_outbox"
+
+    # Written in the same transaction as the change that needs the side effect, so a job
+    # exists if and only if that change committed. See backend/app/jobs.py
+    job_id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(TIMESTAMP, nullable=False, default=utcnow)
+    run_after = Column(TIMESTAMP, nullable=False, default=utcnow)
+    # Set while a worker runs the job; a crashed worker's lease simply expires
+    locked_until = Column(TIMESTAMP)
+    failed_at = Column(TIMESTAMP)
+    last_error = Column(Text)
+
+    __table_args__ = (
+        Index(
+            "ix_job_outbox_pending_run_after", "run_after", "job_id",
+            postgresql_where=failed_at.is_(None), sqlite_where=failed_at.is_(None),
+        ),
+    )
+
+
+# ========================
+# ARCHIVE TABLES
+# ========================
+
+class IncidentArchive(Base):
+    __tablename__ = "incident_archive"
+
+    # Closed incidents moved out of the hot table by the archival job; same ids and columns
+    incident_id = Column(Integer, primary_key=True, autoincrement=False)
+    opened_at = Column(TIMESTAMP, nullable=False)
+    status_id = Column(Integer, ForeignKey("incident_status.status_id"), nullable=False)
+    description = Column(Text, nullable=False)
+    reporter_id = Column(Integer, ForeignKey("user.user_id", ondelete="SET NULL"))
+    resolver_id = Column(Integer, ForeignKey("user.user_id", ondelete="SET NULL"))
+    office_id = Column(Integer, ForeignKey("office.office_id", ondelete="CASCADE"))
+    device_id = Column(Integer, ForeignKey("device.device_id", ondelete="SET NULL"))
+    resolved_at = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP, nullable=False)
+    archived_at = Column(TIMESTAMP, nullable=False, default=utcnow)
+
+    status = relationship("IncidentStatus", viewonly=True)
+    reporter = relationship("User", foreign_keys=[reporter_id], viewonly=True)
+    resolver = relationship("User", foreign_keys=[resolver_id], viewonly=True)
+    office = relationship("Office", viewonly=True)
+    device = relationship("Device", viewonly=True)
+    history = relationship(
+        "IncidentHistoryArchive",
+        primaryjoin="IncidentArchive.incident_id == foreign(IncidentHistoryArchive.incident_id)",
+        order_by="(IncidentHistoryArchive.date, IncidentHistoryArchive.history_id)",
+        viewonly=True,
+    )
+
+    __table_args__ = (
+        Index("ix_incident_archive_opened_at_id", "opened_at", "incident_id"),
+    )
+
+
+class IncidentHistoryArchive(Base):
+    __tablename__ = "incident_history_archive"
+
+    history_id = Column(Integer, primary_key=True, autoincrement=False)
+    incident_id = Column(Integer, nullable=False)
     status_id = Column(Integer, ForeignKey("incident_status.status_id"), nullable=False)
     date = Column(TIMESTAMP, nullable=False)
     comment = Column(Text)
 
-    incident = relationship("Incident", back_populates="history")
-    status = relationship("IncidentStatus", back_populates="history")
\ No newline at end of file
+    __table_args__ = (
+        Index("ix_incident_history_archive_incident_date_id", "incident_id", "date", "history_id"),
+    )
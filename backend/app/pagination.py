@@ -0,0 +1,45 @@
+import base64
+from datetime import datetime
+from typing import Dict, Tuple
+
+# ========================
+# KEYSET CURSORS
+# ========================
+
+def encode_token(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_token(token: str) -> str:
+    padded = token + "=" * (-len(token) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode()
+
+def encode_cursor(position: datetime, row_id: int) -> str:
+    return encode_token(f"{position.isoformat()}|{row_id}")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        position, row_id = decode_token(cursor).split("|", 1)
+        return datetime.fromisoformat(position), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+# ========================
+# SYNC WATERMARKS
+# ========================
+
+# One keyset position per synced stream, e.g. {"incidents": (change_seq, incident_id)}
+def encode_watermark(positions: Dict[str, Tuple[int, int]]) -> str:
+    return encode_token(";".join(
+        f"{name}={change_seq}|{row_id}" for name, (change_seq, row_id) in sorted(positions.items())
+    ))
+
+def decode_watermark(watermark: str) -> Dict[str, Tuple[int, int]]:
+    try:
+        positions = {}
+        for part in decode_token(watermark).split(";"):
+            name, position = part.split("=", 1)
+            change_seq, row_id = position.split("|", 1)
+            positions[name] = (int(change_seq), int(row_id))
+        return positions
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid watermark: {watermark}") from e
@@ -0,0 +1,188 @@
+import os
+from collections import Counter
+from datetime import datetime
+from typing import List
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.app import models, crud, events
+from backend.app.models import utcnow
+
+ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", "24"))
+ARCHIVABLE_STATUSES = ("resolved", "closed")
+
+# Partitioned table -> range key
+PARTITIONED_TABLES = {
+    models.Incident.__table__: "opened_at",
+    models.IncidentHistory.__table__: "date",
+}
+
+# ========================
+# MONTH HELPERS
+# ========================
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def partition_name(table_name: str, month: datetime) -> str:
+    return f"{table_name}_p{month:%Y%m}"
+
+# ========================
+# POSTGRES PARTITIONS
+# ========================
+
+async def is_partitioned(db: AsyncSession, table_name: str) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    result = await db.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name)"),
+        {"name": table_name},
+    )
+    return result.scalar() is not None
+
+async def existing_partitions(db: AsyncSession, table_name: str) -> List[str]:
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = to_regclass(:name) ORDER BY c.relname"
+        ),
+        {"name": table_name},
+    )
+    return list(result.scalars())
+
+async def create_month_partition(db: AsyncSession, table, month: datetime):
+    key = PARTITIONED_TABLES[table]
+    name = partition_name(table.name, month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    # Generated columns (search_vector) are recomputed on insert, so only mapped columns move
+    columns = ", ".join(f'"{column.name}"' for column in table.columns)
+    in_month = f"{key} >= :start AND {key} < :end"
+
+    # Postgres refuses to attach a range the default partition already holds rows for,
+    # so those rows are parked in a temp table and re-routed once the partition exists
+    await db.execute(
+        text(f"CREATE TEMP TABLE partition_move ON COMMIT DROP AS SELECT {columns} FROM {table.name}_default WHERE {in_month}"),
+        bounds,
+    )
+    await db.execute(text(f"DELETE FROM {table.name}_default WHERE {in_month}"), bounds)
+    await db.execute(text(
+        f"CREATE TABLE {name} PARTITION OF {table.name} "
+        f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+    ))
+    await db.execute(text(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM partition_move"))
+    await db.commit()
+    return name
+
+async def ensure_partitions(db: AsyncSession, months_ahead: int = 3) -> List[str]:
+    created = []
+    for table, key in PARTITIONED_TABLES.items():
+        if not await is_partitioned(db, table.name):
+            continue
+        existing = set(await existing_partitions(db, table.name))
+        # Months already sitting in the default partition plus the coming ones
+        result = await db.execute(text(f"SELECT DISTINCT date_trunc('month', {key}) FROM {table.name}_default"))
+        months = {month for month in result.scalars()}
+        current = month_start(utcnow())
+        months.update(add_months(current, offset) for offset in range(months_ahead + 1))
+        for month in sorted(months):
+            if partition_name(table.name, month) not in existing:
+                created.append(await create_month_partition(db, table, month))
+    return created
+
+async def drop_empty_partitions(db: AsyncSession, before: datetime) -> List[str]:
+    dropped = []
+    for table in PARTITIONED_TABLES:
+        if not await is_partitioned(db, table.name):
+            continue
+        for name in await existing_partitions(db, table.name):
+            suffix = name[len(table.name) + 2:]
+            if not name.startswith(f"{table.name}_p") or not suffix.isdigit():
+                continue
+            if datetime.strptime(suffix, "%Y%m") >= month_start(before):
+                continue
+            empty = (await db.execute(text(f"SELECT NOT EXISTS (SELECT 1 FROM {name})"))).scalar()
+            if empty:
+                # Dropping a whole month is a catalog change, not a row-by-row delete
+                await db.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+    await db.commit()
+    return dropped
+
+# ========================
+# ARCHIVAL
+# ========================
+
+async def archive_incidents(db: AsyncSession, cutoff: datetime, batch_size: int = 1000) -> int:
+    result = await db.execute(
+        select(models.IncidentStatus.status_id).filter(models.IncidentStatus.name.in_(ARCHIVABLE_STATUSES))
+    )
+    status_ids = list(result.scalars())
+    if not status_ids:
+        return 0
+
+    incident = models.Incident
+    history = models.IncidentHistory
+    # change_seq only orders the live table's sync feed; archived rows go out as tombstones
+    incident_columns = [column for column in incident.__table__.columns if column.name in models.IncidentArchive.__table__.c]
+    history_columns = list(history.__table__.columns)
+    archived = 0
+
+    while True:
+        # The opened_at bound lets Postgres prune to the old partitions
+        in_scope = (incident.status_id.in_(status_ids), incident.opened_at < cutoff)
+        # Locked until commit so a concurrent update cannot reopen a row halfway through;
+        # rows being edited right now are left for the next run
+        result = await db.execute(
+            select(incident.incident_id).filter(*in_scope)
+            .order_by(incident.opened_at, incident.incident_id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        incident_ids = list(result.scalars())
+        if not incident_ids:
+            break
+        # Every write re-checks the scope, so only rows still archivable move (SQLite takes
+        # no row locks, but the first write holds its database lock until commit)
+        still_in_scope = select(incident.incident_id).filter(incident.incident_id.in_(incident_ids), *in_scope)
+
+        history_rows = (await db.execute(
+            delete(history).where(history.incident_id.in_(still_in_scope)).returning(*history_columns)
+        )).mappings().all()
+        incident_rows = (await db.execute(
+            delete(incident).where(incident.incident_id.in_(still_in_scope)).returning(*incident_columns)
+        )).mappings().all()
+        if not incident_rows:
+            await db.commit()
+            continue
+        deleted_ids = [row["incident_id"] for row in incident_rows]
+
+        now = utcnow()
+        await db.execute(insert(models.IncidentArchive), [dict(row, archived_at=now) for row in incident_rows])
+        if history_rows:
+            await db.execute(insert(models.IncidentHistoryArchive), [dict(row) for row in history_rows])
+
+        device_ids = {row["device_id"] for row in incident_rows if row["device_id"] is not None}
+        device_types = dict((await db.execute(
+            select(models.Device.device_id, models.Device.type_id).filter(models.Device.device_id.in_(device_ids))
+        )).all()) if device_ids else {}
+        await crud.bump_incident_stats(db, Counter({
+            key: -count for key, count in Counter(
+                (row["status_id"], row["office_id"] or 0, device_types.get(row["device_id"]) or 0)
+                for row in incident_rows
+            ).items()
+        }))
+
+        # Synced clients drop archived incidents the same way they drop deleted ones
+        await db.execute(
+            insert(models.Tombstone),
+            [{"entity": "incident", "entity_id": incident_id, "deleted_at": now} for incident_id in deleted_ids],
+        )
+        await events.publish(db, "incident", "archived", None, {"count": len(deleted_ids)})
+        await db.commit()
+        archived += len(deleted_ids)
+
+    return archived
@@ -0,0 +1,88 @@
+import asyncio
+import hashlib
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import List, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app import crud, schemas
+
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+
+# ========================
+# REFERENCE DATA SNAPSHOTS
+# ========================
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    etag: str
+    body: bytes
+    loaded_at: float
+
+REFERENCE_SOURCES = {
+    "offices": (crud.get_offices, TypeAdapter(List[schemas.OfficeResponse])),
+    "user_roles": (crud.get_user_roles, TypeAdapter(List[schemas.UserRoleResponse])),
+    "incident_statuses": (crud.get_incident_statuses, TypeAdapter(List[schemas.IncidentStatusResponse])),
+    "device_types": (crud.get_device_types, TypeAdapter(List[schemas.DeviceTypeResponse])),
+}
+
+snapshots: dict = {}
+locks = {name: asyncio.Lock() for name in REFERENCE_SOURCES}
+
+def is_fresh(snapshot: Optional[Snapshot]) -> bool:
+    return snapshot is not None and time.monotonic() - snapshot.loaded_at < REFERENCE_CACHE_TTL
+
+async def get_snapshot(db: AsyncSession, name: str) -> Snapshot:
+    snapshot = snapshots.get(name)
+    if is_fresh(snapshot):
+        return snapshot
+
+    async with locks[name]:
+        snapshot = snapshots.get(name)
+        if is_fresh(snapshot):
+            return snapshot
+
+        loader, adapter = REFERENCE_SOURCES[name]
+        rows = await loader(db)
+        body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+        # Content-derived ETag, so every worker hands out the same tag for the same data
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+        if snapshot is not None and snapshot.etag == etag:
+            version = snapshot.version
+        else:
+            version = snapshot.version + 1 if snapshot else 1
+        snapshots[name] = Snapshot(version, etag, body, time.monotonic())
+        return snapshots[name]
+
+def invalidate(*names: str):
+    for name in names or REFERENCE_SOURCES:
+        if name in snapshots:
+            snapshots[name] = replace(snapshots[name], loaded_at=float("-inf"))
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def snapshot_response(snapshot: Snapshot, if_none_match: Optional[str]) -> Response:
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "no-cache",
+        "X-Snapshot-Version": str(snapshot.version),
+    }
+    if etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+def embed_snapshots(body: bytes, snapshots_by_name: dict) -> bytes:
+    # Splices pre-serialized snapshots into a JSON object without re-encoding them
+    fields = b"".join(
+        b',"' + name.encode() + b'":' + snapshot.body
+        for name, snapshot in snapshots_by_name.items()
+    )
+    return body[:-1] + fields + b"}"
@@ -0,0 +1,13 @@
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+# ========================
+# JSON RESPONSES
+# ========================
+
+class OrjsonResponse(JSONResponse):
+    # For handlers that return plain rows: orjson encodes datetimes and dates itself, so
+    # the content skips jsonable_encoder and the response_model validation
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field
+from datetime import date, datetime
 from typing import Optional, List
 
 # ========================
@@ -105,6 +105,7 @@ class UserResponse(UserBase):
     user_id: int
     office_id: Optional[int]
     role_id: int
+    updated_at: Optional[datetime] = None
 
     class Config:
         orm_mode = True
@@ -162,15 +163,78 @@ class IncidentUpdate(BaseModel):
     resolver_id: Optional[int] = None
     resolved_at: Optional[datetime] = None
     device_id: Optional[int] = None
+    comment: Optional[str] = None
 
 class IncidentResponse(IncidentBase):
     incident_id: int
+    # The reporter's foreign key is SET NULL when that user is deleted
+    reporter_id: Optional[int] = None
     opened_at: datetime
     resolved_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         orm_mode = True
 
+class IncidentFilter(BaseModel):
+    status_id: Optional[int] = None
+    office_id: Optional[int] = None
+    reporter_id: Optional[int] = None
+    resolver_id: Optional[int] = None
+    opened_from: Optional[datetime] = None
+    opened_to: Optional[datetime] = None
+
+class IncidentPage(BaseModel):
+    items: List[IncidentResponse]
+    next_cursor: Optional[str] = None
+
+class IncidentSearchHit(IncidentResponse):
+    rank: float
+    highlight: str
+
+class IncidentSearchPage(BaseModel):
+    items: List[IncidentSearchHit]
+    next_offset: Optional[int] = None
+
+class IncidentStatsGroup(BaseModel):
+    id: Optional[int] = None
+    count: int
+
+class IncidentStats(BaseModel):
+    total: int
+    by_status: List[IncidentStatsGroup]
+    by_office: List[IncidentStatsGroup]
+    by_device_type: List[IncidentStatsGroup]
+
+class ResolutionStatsGroup(BaseModel):
+    office_id: Optional[int] = None
+    type_id: Optional[int] = None
+    count: int
+    mean_seconds: float
+    p50_seconds: float
+    p90_seconds: float
+
+class ResolutionStats(BaseModel):
+    date_from: date
+    date_to: date
+    group_by: str
+    groups: List[ResolutionStatsGroup]
+
+class IncidentBulkSelection(BaseModel):
+    # Explicit ids, a filter, or both (the filter then narrows the id list)
+    incident_ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filters: Optional[IncidentFilter] = None
+
+class IncidentBulkUpdate(IncidentBulkSelection):
+    status_id: Optional[int] = None
+    resolver_id: Optional[int] = None
+    resolved_at: Optional[datetime] = None
+    comment: Optional[str] = None
+
+class IncidentBulkResult(BaseModel):
+    incident_ids: List[int]
+    count: int
+
 class IncidentWithRelations(IncidentResponse):
     status: Optional[IncidentStatusResponse] = None
     reporter: Optional[UserResponse] = None
@@ -202,12 +266,53 @@ class IncidentHistoryResponse(IncidentHistoryBase):
     class Config:
         orm_mode = True
 
+class IncidentHistoryPage(BaseModel):
+    items: List[IncidentHistoryResponse]
+    next_cursor: Optional[str] = None
+
 class IncidentHistoryWithRelations(IncidentHistoryResponse):
     incident: Optional[IncidentResponse] = None
     status: Optional[IncidentStatusResponse] = None
 
 IncidentWithRelations.model_rebuild()
 
+class IncidentExpandedPage(BaseModel):
+    items: List[IncidentWithRelations]
+    next_cursor: Optional[str] = None
+
+# ========================
+# DASHBOARD SCHEMAS
+# ========================
+
+class DashboardBootstrap(BaseModel):
+    user: UserResponse
+    incidents: IncidentPage
+    users: Optional[List[UserResponse]] = None
+    stats: Optional[IncidentStats] = None
+    offices: List[OfficeResponse] = []
+    user_roles: List[UserRoleResponse] = []
+    incident_statuses: List[IncidentStatusResponse] = []
+    device_types: List[DeviceTypeResponse] = []
+
+# ========================
+# DELTA SYNC SCHEMAS
+# ========================
+
+class TombstoneResponse(BaseModel):
+    entity: str
+    entity_id: int
+    deleted_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class SyncPage(BaseModel):
+    incidents: List[IncidentResponse]
+    users: Optional[List[UserResponse]] = None
+    deleted: List[TombstoneResponse]
+    watermark: str
+    has_more: bool
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
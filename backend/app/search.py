@@ -0,0 +1,78 @@
+import html
+from typing import Optional
+from sqlalchemy import func, literal_column, table, column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.app import models, schemas, crud
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+# The database marks matches with these private-use characters; the text around them
+# is HTML-escaped before they become tags, so a description cannot inject markup
+MATCH_START = "\ue000"
+MATCH_STOP = "\ue001"
+
+# ========================
+# INCIDENT SEARCH
+# ========================
+
+def postgres_search_query(q: str):
+    vector = literal_column("incident.search_vector")
+    language = literal_column(f"'{models.SEARCH_LANGUAGE}'::regconfig")
+    tsquery = func.websearch_to_tsquery(language, q)
+    rank = func.ts_rank(vector, tsquery)
+    highlight = func.ts_headline(
+        language, models.Incident.description, tsquery,
+        f"StartSel={MATCH_START}, StopSel={MATCH_STOP}, MaxFragments=2",
+    )
+    return (
+        select(*crud.INCIDENT_ROW_COLUMNS, rank.label("rank"), highlight.label("highlight"))
+        .filter(vector.op("@@")(tsquery))
+        .order_by(rank.desc(), models.Incident.incident_id.desc())
+    )
+
+def sqlite_match_expression(q: str) -> str:
+    # Quote every term so user input is never parsed as FTS5 query syntax
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+def sqlite_search_query(q: str):
+    fts = table("incident_fts", column("rowid"))
+    fts_table = literal_column("incident_fts")
+    # bm25() is lower-is-better; negate it so rank sorts like ts_rank
+    rank = -func.bm25(fts_table)
+    highlight = func.highlight(fts_table, 0, MATCH_START, MATCH_STOP)
+    return (
+        select(*crud.INCIDENT_ROW_COLUMNS, rank.label("rank"), highlight.label("highlight"))
+        .select_from(fts)
+        .join(models.Incident, models.Incident.incident_id == fts.c.rowid)
+        .filter(fts_table.op("MATCH")(sqlite_match_expression(q)))
+        .order_by(rank.desc(), models.Incident.incident_id.desc())
+    )
+
+def render_highlight(marked: str) -> str:
+    return html.escape(marked).replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_STOP, HIGHLIGHT_STOP)
+
+async def search_incidents(
+    db: AsyncSession,
+    q: str,
+    filters: schemas.IncidentFilter,
+    limit: int = 20,
+    offset: int = 0,
+):
+    if db.get_bind().dialect.name == "postgresql":
+        query = postgres_search_query(q)
+    else:
+        query = sqlite_search_query(q)
+    query = crud.apply_incident_filters(query, filters).limit(limit + 1).offset(offset)
+
+    result = await db.execute(query)
+    items = crud.row_dicts(result)
+    for item in items:
+        item["highlight"] = render_highlight(item["highlight"])
+
+    next_offset: Optional[int] = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_offset = offset + limit
+
+    return {"items": items, "next_offset": next_offset}
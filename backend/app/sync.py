@@ -0,0 +1,95 @@
+from typing import Dict, Optional, Tuple
+from sqlalchemy import text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.app import models
+from backend.app.pagination import encode_watermark
+
+# Oldest transaction still running: every change_seq below it belongs to a transaction
+# that has finished, so nothing can commit behind a position handed out from under it
+CHANGE_FENCE_QUERY = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+# ========================
+# DELTA SYNC
+# ========================
+
+SYNC_STREAMS = {
+    "incidents": (models.Incident, models.Incident.change_seq, models.Incident.incident_id),
+    "users": (models.User, models.User.change_seq, models.User.user_id),
+    "deleted": (models.Tombstone, models.Tombstone.change_seq, models.Tombstone.tombstone_id),
+}
+
+async def change_fence(db: AsyncSession) -> Optional[int]:
+    # SQLite commits one writer at a time in change_seq order, so everything visible is final
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return (await db.execute(CHANGE_FENCE_QUERY)).scalar()
+
+async def read_stream(
+    db: AsyncSession,
+    name: str,
+    after: Optional[Tuple[int, int]],
+    fence: Optional[int],
+    limit: int,
+    query_filter=None,
+):
+    model, change_seq, key = SYNC_STREAMS[name]
+    query = select(model)
+    if fence is not None:
+        query = query.filter(change_seq < fence)
+    if after is not None:
+        query = query.filter(tuple_(change_seq, key) > tuple_(*after))
+    if query_filter is not None:
+        query = query.filter(query_filter)
+    query = query.order_by(change_seq, key).limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = result.scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    position = after
+    if rows:
+        last = rows[-1]
+        position = (last.change_seq, getattr(last, key.key))
+    if not has_more and fence is not None:
+        # Everything below the fence has been seen; jump there so filtered-out rows are not rescanned
+        position = max(position, (fence, 0)) if position else (fence, 0)
+    return rows, position, has_more
+
+async def get_changes(
+    db: AsyncSession,
+    since: Dict[str, Tuple[int, int]],
+    limit: int = 500,
+    include_users: bool = False,
+    reporter_id: Optional[int] = None,
+):
+    fence = await change_fence(db)
+    positions = {}
+    has_more = False
+
+    incidents, positions["incidents"], more = await read_stream(
+        db, "incidents", since.get("incidents"), fence, limit,
+        models.Incident.reporter_id == reporter_id if reporter_id is not None else None,
+    )
+    has_more |= more
+
+    users = None
+    entities = ["incident"]
+    if include_users:
+        users, positions["users"], more = await read_stream(db, "users", since.get("users"), fence, limit)
+        has_more |= more
+        entities.append("user")
+
+    deleted, positions["deleted"], more = await read_stream(
+        db, "deleted", since.get("deleted"), fence, limit, models.Tombstone.entity.in_(entities)
+    )
+    has_more |= more
+
+    return {
+        "incidents": incidents,
+        "users": users,
+        "deleted": deleted,
+        "watermark": encode_watermark({name: position for name, position in positions.items() if position}),
+        "has_more": has_more,
+    }
@@ -1,8 +1,10 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Header, Response, Request
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from typing import List  
+from typing import List, Optional
 from contextlib import asynccontextmanager
+from datetime import date, timedelta
+import asyncio
 import sys
 from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware  
@@ -14,45 +16,53 @@ project_root = backend_dir.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(backend_dir))
 
-from app import schemas, crud, models, auth
-from app.database import get_db
+from app import schemas, crud, models, auth, database, bulk_import, export, search, sync
+from app.responses import OrjsonResponse
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_user
+from app.pagination import decode_cursor, decode_watermark
+from backend.app.cache import cache_stats
+from backend.app import reference_data, metrics, events, analytics, jobs
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up application...")
     
+    # Schema, reference data and the admin user are set up once by scripts/manage.py
     try:
-        from app.init_db import init_db
-        await init_db()
-        print("Database initialized successfully")
+        from app.init_db import check_schema_version
+        revision = await check_schema_version(database.engine)
+        print(f"Database schema at revision {revision}")
     except Exception as e:
-        print(f"Database initialization failed: {e}")
+        print(f"Database schema check failed: {e}")
         raise
     
-    try:
-        from scripts.create_admin import create_admin_user
-        await create_admin_user()
-        print("Admin user created successfully")
-    except Exception as e:
-        print(f"Admin creation failed (run manually): {e}")
-        print("Run: python scripts/create_admin.py")
+    events.start_listener(database.engine)
+    database.replica_monitor.start(database.read_engine)
+    jobs.start_workers(database.AsyncSessionLocal)
     
     yield
     
     print("Shutting down application...")
+    await jobs.stop_workers()
+    await database.replica_monitor.stop()
+    await events.stop_listener()
 
 app = FastAPI(
     title="Incidens API",
     lifespan=lifespan
 )
 
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(database.ReadYourWritesMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://localhost:3000", "http://127.0.0.1:5173"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[database.READ_AFTER_HEADER],
 )
 
 @app.post("/login/")
@@ -76,12 +86,90 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": "API is running normally"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(current_user: models.User = Depends(get_current_user)):
+    # Route names, traffic and queue depth are internal; scrape with an admin token
+    if current_user.role_id != 1:
+        raise HTTPException(status_code=403, detail="No autorizado")
+    return PlainTextResponse(metrics.render_prometheus() + jobs.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/internal/cache")
+async def get_cache_stats(current_user: models.User = Depends(get_current_user)):
+    if current_user.role_id != 1:
+        raise HTTPException(status_code=403, detail="No autorizado")
+    return cache_stats()
+
+@app.get("/dashboard/bootstrap", response_model=schemas.DashboardBootstrap)
+async def dashboard_bootstrap(
+    request: Request,
+    incident_limit: int = Query(50, ge=1, le=500),
+    current_user: models.User = Depends(get_current_user)
+):
+    is_admin = current_user.role_id == 1
+    # Technicians and admins see every incident; regular users only their own
+    filters = schemas.IncidentFilter(reporter_id=None if current_user.role_id in (1, 2) else current_user.user_id)
+    
+    # One session per query so they run on separate pooled connections
+    session_factory = await database.read_session_factory(request)
+    async def in_session(func, *args, **kwargs):
+        async with session_factory() as session:
+            return await func(session, *args, **kwargs)
+    
+    queries = {"incidents": in_session(crud.get_incident_rows, filters, limit=incident_limit)}
+    if is_admin:
+        queries["users"] = in_session(crud.get_user_rows)
+        queries["stats"] = in_session(crud.get_incident_stats)
+    for name in reference_data.REFERENCE_SOURCES:
+        queries[name] = in_session(reference_data.get_snapshot, name)
+    
+    results = dict(zip(queries, await asyncio.gather(*queries.values())))
+    
+    payload = schemas.DashboardBootstrap.model_validate(
+        {
+            "user": current_user,
+            "incidents": results["incidents"],
+            "users": results.get("users"),
+            "stats": results.get("stats"),
+        },
+        from_attributes=True,
+    )
+    body = payload.model_dump_json(exclude=set(reference_data.REFERENCE_SOURCES)).encode()
+    snapshots = {name: results[name] for name in reference_data.REFERENCE_SOURCES}
+    return Response(content=reference_data.embed_snapshots(body, snapshots), media_type="application/json")
+
+@app.get("/events")
+async def stream_events(token: Optional[str] = None, authorization: Optional[str] = Header(None)):
+    # EventSource cannot send headers, so the token may also come as ?token=
+    if token is None and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    # Own short-lived session: the stream must not hold a pooled connection open
+    async with database.AsyncSessionLocal() as db:
+        current_user = await get_current_user(token, db)
+    return StreamingResponse(
+        events.event_stream(current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/internal/pool")
+async def get_pool_stats(current_user: models.User = Depends(get_current_user)):
+    if current_user.role_id != 1:
+        raise HTTPException(status_code=403, detail="No autorizado")
+    return {**database.pool_stats(), "replica": database.replica_stats()}
+
+@app.get("/internal/jobs")
+async def get_job_stats(current_user: models.User = Depends(get_current_user)):
+    if current_user.role_id != 1:
+        raise HTTPException(status_code=403, detail="No autorizado")
+    return jobs.jobs_stats()
+
 @app.get("/users/", response_model=List[schemas.UserResponse])
-async def get_users(db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def get_users(db: AsyncSession = Depends(get_read_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role_id != 1:
         raise HTTPException(status_code=403, detail="No autorizado")
-    result = await db.execute(select(models.User))
-    return result.scalars().all()
+    return OrjsonResponse(await crud.get_user_rows(db))
 
 @app.post("/users/", response_model=schemas.UserResponse)
 async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
@@ -93,7 +181,10 @@ async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_d
 async def update_user(user_id: int, user: schemas.UserUpdate, db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     if current_user.role_id != 1:
         raise HTTPException(status_code=403, detail="No autorizado")
-    return await crud.update_user(db, user_id, user)
+    db_user = await crud.update_user(db, user_id, user)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return db_user
 
 @app.delete("/users/{user_id}")
 async def delete_user(user_id: int, db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
@@ -105,37 +196,238 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(get_db), current_
     return {"message": "Usuario eliminado"}
 
 @app.get("/offices/", response_model=List[schemas.OfficeResponse])
-async def get_offices(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Office))
-    return result.scalars().all()
+async def get_offices(if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_read_db)):
+    snapshot = await reference_data.get_snapshot(db, "offices")
+    return reference_data.snapshot_response(snapshot, if_none_match)
 
 @app.get("/user-roles/", response_model=List[schemas.UserRoleResponse])
-async def get_user_roles(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.UserRole))
-    return result.scalars().all()
+async def get_user_roles(if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_read_db)):
+    snapshot = await reference_data.get_snapshot(db, "user_roles")
+    return reference_data.snapshot_response(snapshot, if_none_match)
 
 @app.get("/incident-statuses/", response_model=List[schemas.IncidentStatusResponse])
-async def get_incident_statuses(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.IncidentStatus))
-    return result.scalars().all()
+async def get_incident_statuses(if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_read_db)):
+    snapshot = await reference_data.get_snapshot(db, "incident_statuses")
+    return reference_data.snapshot_response(snapshot, if_none_match)
 
 @app.get("/device-types/", response_model=List[schemas.DeviceTypeResponse])
-async def get_device_types(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.DeviceType))
-    return result.scalars().all()
+async def get_device_types(if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_read_db)):
+    snapshot = await reference_data.get_snapshot(db, "device_types")
+    return reference_data.snapshot_response(snapshot, if_none_match)
+
+@app.get("/sync", response_model=schemas.SyncPage)
+async def sync_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    try:
+        positions = decode_watermark(since) if since else {}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Watermark inválido")
+    return await sync.get_changes(
+        db, positions, limit=limit,
+        include_users=current_user.role_id == 1,
+        # Technicians and admins see every incident; regular users only their own
+        reporter_id=None if current_user.role_id in (1, 2) else current_user.user_id,
+    )
+
+EXPAND_DESCRIPTION = "Comma-separated relations to embed: " + ",".join(crud.INCIDENT_EXPANSIONS)
+
+def parse_expand(expand: Optional[str]):
+    try:
+        return crud.parse_expand(expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Expansión desconocida: {e}")
+
+def expanded_incident(db_incident, expand) -> dict:
+    # Columns plus the requested relations only: the others are unloaded and would raise
+    fields = {name: getattr(db_incident, name) for name in schemas.IncidentResponse.model_fields}
+    return {**fields, **{name: getattr(db_incident, name) for name in expand}}
 
-@app.get("/incidents/", response_model=List[schemas.IncidentResponse])
-async def get_incidents(db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    result = await db.execute(select(models.Incident))
-    return result.scalars().all()
+def expanded_response(payload, expand, nested: Optional[str] = None) -> Response:
+    # Relations that were not requested are left out of the body rather than sent empty
+    excluded = set(crud.INCIDENT_EXPANSIONS) - set(expand)
+    exclude = {nested: {"__all__": excluded}} if nested else excluded
+    return Response(content=payload.model_dump_json(exclude=exclude), media_type="application/json")
+
+@app.get("/incidents/", response_model=schemas.IncidentExpandedPage)
+async def get_incidents(
+    limit: int = Query(50, ge=1, le=500),
+    after: Optional[str] = None,
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
+    filters: schemas.IncidentFilter = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    try:
+        cursor = decode_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    relations = parse_expand(expand)
+    if not relations:
+        return OrjsonResponse(await crud.get_incident_rows(db, filters, limit=limit, after=cursor))
+    page = await crud.get_incidents(db, filters, limit=limit, after=cursor, expand=relations)
+    page["items"] = [expanded_incident(db_incident, relations) for db_incident in page["items"]]
+    payload = schemas.IncidentExpandedPage.model_validate(page, from_attributes=True)
+    return expanded_response(payload, relations, nested="items")
+
+@app.get("/incidents/stats", response_model=schemas.IncidentStats)
+async def get_incident_stats(db: AsyncSession = Depends(get_read_db), current_user: models.User = Depends(get_current_user)):
+    return await crud.get_incident_stats(db)
+
+@app.get("/analytics/resolution", response_model=schemas.ResolutionStats)
+async def get_resolution_stats(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    group_by: str = Query("office,device_type"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    if current_user.role_id != 1:
+        raise HTTPException(status_code=403, detail="No autorizado")
+    if group_by not in analytics.RESOLUTION_GROUPINGS:
+        raise HTTPException(status_code=400, detail=f"group_by debe ser uno de: {', '.join(analytics.RESOLUTION_GROUPINGS)}")
+    date_to = date_to or models.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=30)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="La fecha inicial no puede ser posterior a la final")
+    return await analytics.get_resolution_stats(db, date_from, date_to, group_by)
+
+@app.get("/incidents/search", response_model=schemas.IncidentSearchPage)
+async def search_incidents(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    filters: schemas.IncidentFilter = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    return OrjsonResponse(await search.search_incidents(db, q, filters, limit=limit, offset=offset))
+
+@app.get("/incidents/export")
+async def export_incidents(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    filters: schemas.IncidentFilter = Depends(),
+    current_user: models.User = Depends(get_current_user)
+):
+    if current_user.role_id != 1:
+        raise HTTPException(status_code=403, detail="No autorizado")
+    return StreamingResponse(
+        export.export_incidents(filters, format, await database.read_session_factory(request)),
+        media_type=export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="incidents.{format}"'},
+    )
+
+@app.get("/incidents/history/export")
+async def export_incident_history(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    filters: schemas.IncidentFilter = Depends(),
+    current_user: models.User = Depends(get_current_user)
+):
+    if current_user.role_id != 1:
+        raise HTTPException(status_code=403, detail="No autorizado")
+    return StreamingResponse(
+        export.export_incident_history(filters, format, await database.read_session_factory(request)),
+        media_type=export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="incident_history.{format}"'},
+    )
+
+@app.post("/queue/claim", response_model=schemas.IncidentResponse)
+async def claim_incident(db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    if current_user.role_id not in (1, 2):
+        raise HTTPException(status_code=403, detail="No autorizado")
+    db_incident = await crud.claim_next_incident(db, current_user)
+    if db_incident is None:
+        raise HTTPException(status_code=404, detail="No hay incidencias pendientes")
+    return db_incident
 
 @app.post("/incidents/", response_model=schemas.IncidentResponse)
 async def create_incident(incident: schemas.IncidentCreate, db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     return await crud.create_incident(db, incident)
 
+@app.post("/incidents/import")
+async def import_incidents(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    batch_size: int = Query(5000, ge=1, le=50000),
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    if current_user.role_id != 1:
+        raise HTTPException(status_code=403, detail="No autorizado")
+    return await bulk_import.import_incidents(db, request.stream(), format, batch_size=batch_size)
+
+def check_bulk_selection(selection: schemas.IncidentBulkSelection, current_user: models.User):
+    if current_user.role_id not in (1, 2):
+        raise HTTPException(status_code=403, detail="No autorizado")
+    filters = selection.filters.model_dump(exclude_none=True) if selection.filters else {}
+    # An empty selection would touch every incident in the table
+    if selection.incident_ids is None and not filters:
+        raise HTTPException(status_code=400, detail="Indica incident_ids o al menos un filtro")
+
+@app.patch("/incidents/bulk", response_model=schemas.IncidentBulkResult)
+async def bulk_update_incidents(
+    changes: schemas.IncidentBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    check_bulk_selection(changes, current_user)
+    if not changes.model_dump(include={"status_id", "resolver_id", "resolved_at"}, exclude_unset=True):
+        raise HTTPException(status_code=400, detail="No hay cambios que aplicar")
+    incident_ids = await crud.bulk_update_incidents(db, changes)
+    return {"incident_ids": incident_ids, "count": len(incident_ids)}
+
+@app.delete("/incidents/bulk", response_model=schemas.IncidentBulkResult)
+async def bulk_delete_incidents(
+    selection: schemas.IncidentBulkSelection,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    check_bulk_selection(selection, current_user)
+    incident_ids = await crud.bulk_delete_incidents(db, selection)
+    return {"incident_ids": incident_ids, "count": len(incident_ids)}
+
+@app.get("/incidents/{incident_id}", response_model=schemas.IncidentWithRelations)
+async def get_incident(
+    incident_id: int,
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    relations = parse_expand(expand)
+    db_incident = await crud.get_incident_by_id(db, incident_id, expand=relations, include_archived=True)
+    if db_incident is None:
+        raise HTTPException(status_code=404, detail="Incidencia no encontrada")
+    payload = schemas.IncidentWithRelations.model_validate(expanded_incident(db_incident, relations), from_attributes=True)
+    return expanded_response(payload, relations)
+
+@app.get("/incidents/{incident_id}/history", response_model=schemas.IncidentHistoryPage)
+async def get_incident_history(
+    incident_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    try:
+        cursor = decode_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    page = await crud.get_incident_history(db, incident_id, limit=limit, after=cursor, include_archived=True)
+    if not page["items"] and cursor is None and not await crud.get_incident_by_id(db, incident_id, include_archived=True):
+        raise HTTPException(status_code=404, detail="Incidencia no encontrada")
+    return OrjsonResponse(page)
+
 @app.put("/incidents/{incident_id}", response_model=schemas.IncidentResponse)
 async def update_incident(incident_id: int, incident: schemas.IncidentUpdate, db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    return await crud.update_incident(db, incident_id, incident)
+    db_incident = await crud.update_incident(db, incident_id, incident)
+    if db_incident is None:
+        raise HTTPException(status_code=404, detail="Incidencia no encontrada")
+    return db_incident
 
 @app.delete("/incidents/{incident_id}")
 async def delete_incident(incident_id: int, db: AsyncSession = Depends(get_db), current_user: models.User = Depends(get_current_user)):
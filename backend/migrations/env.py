@@ -0,0 +1,70 @@
+import asyncio
+import os
+import re
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.database import Base, DATABASE_URL
+from backend.app import models  # noqa: F401  (registers the tables on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Created by raw DDL in the migrations (search) or by maintenance (monthly partitions),
+# so they are not in the metadata and autogenerate must not try to drop them
+UNMAPPED_TABLES = re.compile(r"^(incident_fts.*|(incident|incident_history)_(default|p\d{6}))$")
+UNMAPPED_NAMES = {"search_vector", "ix_incident_search_vector"}
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table" and UNMAPPED_TABLES.match(name or ""):
+        return False
+    return name not in UNMAPPED_NAMES
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or DATABASE_URL
+
+def configure(**options):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite cannot ALTER most things in place; batch mode rebuilds the table
+        render_as_batch=database_url().startswith("sqlite"),
+        **options,
+    )
+
+def run_migrations_offline():
+    configure(url=database_url(), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_sync_migrations(connection):
+    configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+async def run_async_migrations():
+    engine = create_async_engine(database_url())
+    async with engine.connect() as connection:
+        await connection.run_sync(run_sync_migrations)
+    await engine.dispose()
+
+def run_migrations_online():
+    # A caller that already holds a connection (tests, scripts) can pass it in
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_sync_migrations(connection)
+    else:
+        asyncio.run(run_async_migrations())
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
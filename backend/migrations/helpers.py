@@ -0,0 +1,28 @@
+import sqlalchemy as sa
+from alembic import op
+
+# Databases that predate the migrations were built by create_all, which added new tables
+# on every boot but never columns or indexes on existing ones. They are stamped at the
+# initial revision and upgraded with these guards, so whatever already exists is kept.
+
+def is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+def has_table(table: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table)
+
+def has_column(table: str, column: str) -> bool:
+    return column in {info["name"] for info in sa.inspect(op.get_bind()).get_columns(table)}
+
+def has_index(table: str, name: str) -> bool:
+    return name in {info["name"] for info in sa.inspect(op.get_bind()).get_indexes(table)}
+
+def create_table_if_missing(name: str, *columns, **kwargs) -> bool:
+    if has_table(name):
+        return False
+    op.create_table(name, *columns, **kwargs)
+    return True
+
+def create_index_if_missing(name: str, table: str, columns, **kwargs):
+    if not has_index(table, name):
+        op.create_index(name, table, columns, **kwargs)
@@ -0,0 +1,110 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations.helpers import is_postgres
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def partitioned() -> bool:
+    # Only decided here: an existing incident table cannot be turned into a partitioned one in place
+    return is_postgres() and os.getenv("INCIDENT_PARTITIONING", "false").lower() in ("1", "true", "yes")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    partitioning = partitioned()
+
+    op.create_table(
+        "office",
+        sa.Column("office_id", sa.Integer(), primary_key=True),
+        sa.Column("city", sa.String(100), nullable=False),
+    )
+    op.create_index("ix_office_office_id", "office", ["office_id"])
+
+    for table, key in (("user_role", "role_id"), ("device_type", "type_id"), ("incident_status", "status_id")):
+        op.create_table(
+            table,
+            sa.Column(key, sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(50), nullable=False, unique=True),
+        )
+        op.create_index(f"ix_{table}_{key}", table, [key])
+
+    op.create_table(
+        "user",
+        sa.Column("user_id", sa.Integer(), primary_key=True),
+        sa.Column("office_id", sa.Integer(), sa.ForeignKey("office.office_id", ondelete="SET NULL")),
+        sa.Column("first_name", sa.String(100), nullable=False),
+        sa.Column("last_name", sa.String(150), nullable=False),
+        sa.Column("email", sa.String(150), nullable=False),
+        sa.Column("password_hash", sa.Text(), nullable=False),
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("user_role.role_id"), nullable=False),
+    )
+    op.create_index("ix_user_user_id", "user", ["user_id"])
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    op.create_table(
+        "device",
+        sa.Column("device_id", sa.Integer(), primary_key=True),
+        sa.Column("office_id", sa.Integer(), sa.ForeignKey("office.office_id", ondelete="CASCADE")),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("user.user_id", ondelete="SET NULL")),
+        sa.Column("type_id", sa.Integer(), sa.ForeignKey("device_type.type_id"), nullable=False),
+    )
+    op.create_index("ix_device_device_id", "device", ["device_id"])
+
+    op.create_table(
+        "incident",
+        sa.Column("incident_id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("opened_at", sa.TIMESTAMP(), nullable=False, primary_key=partitioning),
+        sa.Column("status_id", sa.Integer(), sa.ForeignKey("incident_status.status_id"), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("reporter_id", sa.Integer(), sa.ForeignKey("user.user_id", ondelete="SET NULL")),
+        sa.Column("resolver_id", sa.Integer(), sa.ForeignKey("user.user_id", ondelete="SET NULL")),
+        sa.Column("office_id", sa.Integer(), sa.ForeignKey("office.office_id", ondelete="CASCADE")),
+        sa.Column("device_id", sa.Integer(), sa.ForeignKey("device.device_id", ondelete="SET NULL")),
+        sa.Column("resolved_at", sa.TIMESTAMP()),
+        **({"postgresql_partition_by": "RANGE (opened_at)"} if partitioning else {}),
+    )
+    op.create_index("ix_incident_incident_id", "incident", ["incident_id"])
+
+    # Partition keys must be in every unique constraint, so partitioned history has no
+    # foreign key to incident and carries the date in its primary key
+    op.create_table(
+        "incident_history",
+        sa.Column("history_id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "incident_id",
+            sa.Integer(),
+            *(() if partitioning else (sa.ForeignKey("incident.incident_id", ondelete="CASCADE"),)),
+        ),
+        sa.Column("status_id", sa.Integer(), sa.ForeignKey("incident_status.status_id"), nullable=False),
+        sa.Column("date", sa.TIMESTAMP(), nullable=False, primary_key=partitioning),
+        sa.Column("comment", sa.Text()),
+        **({"postgresql_partition_by": "RANGE (date)"} if partitioning else {}),
+    )
+    op.create_index("ix_incident_history_history_id", "incident_history", ["history_id"])
+
+    if partitioning:
+        # Monthly partitions are added by scripts/maintain_partitions.py
+        for table in ("incident", "incident_history"):
+            op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("incident_history", "incident", "device", "user", "incident_status", "device_type", "user_role", "office"):
+        op.drop_table(table)
@@ -0,0 +1,60 @@
+"""Keyset pagination indexes and the incident_stat rollup
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations.helpers import create_index_if_missing, create_table_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INCIDENT_INDEXES = {
+    "ix_incident_opened_at_id": ["opened_at", "incident_id"],
+    "ix_incident_status_opened_at_id": ["status_id", "opened_at", "incident_id"],
+    "ix_incident_office_opened_at_id": ["office_id", "opened_at", "incident_id"],
+    "ix_incident_reporter_opened_at_id": ["reporter_id", "opened_at", "incident_id"],
+    "ix_incident_resolver_opened_at_id": ["resolver_id", "opened_at", "incident_id"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in INCIDENT_INDEXES.items():
+        create_index_if_missing(name, "incident", columns)
+    create_index_if_missing(
+        "ix_incident_history_incident_date_id", "incident_history", ["incident_id", "date", "history_id"]
+    )
+
+    # 0 stands for "no office" / "no device" so every key column can be part of the primary key
+    created = create_table_if_missing(
+        "incident_stat",
+        sa.Column("status_id", sa.Integer(), primary_key=True),
+        sa.Column("office_id", sa.Integer(), primary_key=True),
+        sa.Column("type_id", sa.Integer(), primary_key=True),
+        sa.Column("incident_count", sa.Integer(), nullable=False),
+    )
+    if created:
+        op.execute(
+            "INSERT INTO incident_stat (status_id, office_id, type_id, incident_count) "
+            "SELECT i.status_id, COALESCE(i.office_id, 0), COALESCE(d.type_id, 0), COUNT(*) "
+            "FROM incident i LEFT JOIN device d ON d.device_id = i.device_id "
+            "GROUP BY i.status_id, COALESCE(i.office_id, 0), COALESCE(d.type_id, 0)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("incident_stat")
+    op.drop_index("ix_incident_history_incident_date_id", table_name="incident_history")
+    for name in INCIDENT_INDEXES:
+        op.drop_index(name, table_name="incident")
@@ -0,0 +1,63 @@
+"""Full-text search on incident descriptions
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from backend.migrations.helpers import has_column, has_table, is_postgres
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_LANGUAGE = "spanish"
+
+SQLITE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS incident_fts_insert AFTER INSERT ON incident BEGIN "
+    "INSERT INTO incident_fts(rowid, description) VALUES (new.incident_id, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS incident_fts_delete AFTER DELETE ON incident BEGIN "
+    "INSERT INTO incident_fts(incident_fts, rowid, description) VALUES ('delete', old.incident_id, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS incident_fts_update AFTER UPDATE OF description ON incident BEGIN "
+    "INSERT INTO incident_fts(incident_fts, rowid, description) VALUES ('delete', old.incident_id, old.description); "
+    "INSERT INTO incident_fts(rowid, description) VALUES (new.incident_id, new.description); END",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if is_postgres():
+        # Generated column: Postgres fills it for existing rows while adding it
+        if not has_column("incident", "search_vector"):
+            op.execute(
+                f"ALTER TABLE incident ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_LANGUAGE}', description)) STORED"
+            )
+        op.execute("CREATE INDEX IF NOT EXISTS ix_incident_search_vector ON incident USING GIN (search_vector)")
+        return
+
+    # External-content FTS5 table kept in sync by triggers; 'rebuild' indexes existing rows
+    if not has_table("incident_fts"):
+        op.execute(
+            "CREATE VIRTUAL TABLE incident_fts USING fts5(description, content='incident', content_rowid='incident_id')"
+        )
+        op.execute("INSERT INTO incident_fts(incident_fts) VALUES ('rebuild')")
+    for statement in SQLITE_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if is_postgres():
+        op.execute("DROP INDEX IF EXISTS ix_incident_search_vector")
+        op.execute("ALTER TABLE incident DROP COLUMN IF EXISTS search_vector")
+        return
+    for trigger in ("incident_fts_insert", "incident_fts_delete", "incident_fts_update"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS incident_fts")
@@ -0,0 +1,56 @@
+"""updated_at columns and deletion tombstones for delta sync
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:15:00
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations.helpers import create_index_if_missing, create_table_if_missing, has_column, is_postgres
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = {"user": "user_id", "incident": "incident_id"}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for table, key in SYNCED_TABLES.items():
+        if not has_column(table, "updated_at"):
+            # SQLite only adds NOT NULL columns with a constant default; existing rows then
+            # get the migration time so the next sync of every client picks them up once
+            op.add_column(
+                table,
+                sa.Column("updated_at", sa.TIMESTAMP(), nullable=False, server_default="1970-01-01 00:00:00"),
+            )
+            op.execute(sa.text(f'UPDATE "{table}" SET updated_at = :now').bindparams(now=now))
+            if is_postgres():
+                op.alter_column(table, "updated_at", server_default=None)
+        create_index_if_missing(f"ix_{table}_updated_at_id", table, ["updated_at", key])
+
+    create_table_if_missing(
+        "tombstone",
+        sa.Column("tombstone_id", sa.Integer(), primary_key=True),
+        sa.Column("entity", sa.String(20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.TIMESTAMP(), nullable=False),
+    )
+    create_index_if_missing("ix_tombstone_deleted_at_id", "tombstone", ["deleted_at", "tombstone_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tombstone")
+    for table in SYNCED_TABLES:
+        op.drop_index(f"ix_{table}_updated_at_id", table_name=table)
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,58 @@
+"""Archive tables for old closed incidents
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 09:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations.helpers import create_index_if_missing, create_table_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_table_if_missing(
+        "incident_archive",
+        sa.Column("incident_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("opened_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("status_id", sa.Integer(), sa.ForeignKey("incident_status.status_id"), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("reporter_id", sa.Integer(), sa.ForeignKey("user.user_id", ondelete="SET NULL")),
+        sa.Column("resolver_id", sa.Integer(), sa.ForeignKey("user.user_id", ondelete="SET NULL")),
+        sa.Column("office_id", sa.Integer(), sa.ForeignKey("office.office_id", ondelete="CASCADE")),
+        sa.Column("device_id", sa.Integer(), sa.ForeignKey("device.device_id", ondelete="SET NULL")),
+        sa.Column("resolved_at", sa.TIMESTAMP()),
+        sa.Column("updated_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("archived_at", sa.TIMESTAMP(), nullable=False),
+    )
+    create_index_if_missing("ix_incident_archive_opened_at_id", "incident_archive", ["opened_at", "incident_id"])
+
+    create_table_if_missing(
+        "incident_history_archive",
+        sa.Column("history_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("incident_id", sa.Integer(), nullable=False),
+        sa.Column("status_id", sa.Integer(), sa.ForeignKey("incident_status.status_id"), nullable=False),
+        sa.Column("date", sa.TIMESTAMP(), nullable=False),
+        sa.Column("comment", sa.Text()),
+    )
+    create_index_if_missing(
+        "ix_incident_history_archive_incident_date_id",
+        "incident_history_archive",
+        ["incident_id", "date", "history_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("incident_history_archive")
+    op.drop_table("incident_archive")
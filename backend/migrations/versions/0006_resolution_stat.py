@@ -0,0 +1,100 @@
+"""resolution_stat daily percentile buckets
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 09:25:00
+
+"""
+import math
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations.helpers import create_table_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The bin math of backend.app.analytics as of this revision; the bin of each row is
+# computed in Python because SQLite has no logarithm
+ACCURACY = float(os.getenv("RESOLUTION_SKETCH_ACCURACY", "0.02"))
+LOG_GAMMA = math.log((1 + ACCURACY) / (1 - ACCURACY))
+CHUNK_ROWS = 10000
+
+resolution_stat = sa.table(
+    "resolution_stat",
+    sa.column("day", sa.Date()),
+    sa.column("office_id", sa.Integer()),
+    sa.column("type_id", sa.Integer()),
+    sa.column("bin", sa.Integer()),
+    sa.column("resolved_count", sa.Integer()),
+    sa.column("total_seconds", sa.Float()),
+)
+device = sa.table("device", sa.column("device_id", sa.Integer()), sa.column("type_id", sa.Integer()))
+
+
+def resolved_incidents(name: str, after: int):
+    incident = sa.table(
+        name,
+        sa.column("incident_id", sa.Integer()),
+        sa.column("opened_at", sa.DateTime()),
+        sa.column("resolved_at", sa.DateTime()),
+        sa.column("office_id", sa.Integer()),
+        sa.column("device_id", sa.Integer()),
+    )
+    return (
+        sa.select(incident.c.incident_id, incident.c.opened_at, incident.c.resolved_at, incident.c.office_id, device.c.type_id)
+        .select_from(incident.outerjoin(device, device.c.device_id == incident.c.device_id))
+        .where(incident.c.incident_id > after, incident.c.resolved_at.isnot(None), incident.c.opened_at.isnot(None))
+        .order_by(incident.c.incident_id)
+        .limit(CHUNK_ROWS)
+    )
+
+
+def backfill() -> None:
+    # Archived incidents count too, as in scripts/rebuild_resolution_stats.py. Read in keyset
+    # chunks: a server-side cursor would stay open on asyncpg and block the later DDL
+    buckets = {}
+    bind = op.get_bind()
+    for name in ("incident", "incident_archive"):
+        after = 0
+        while rows := bind.execute(resolved_incidents(name, after)).all():
+            for incident_id, opened_at, resolved_at, office_id, type_id in rows:
+                seconds = max((resolved_at - opened_at).total_seconds(), 0.0)
+                index = 0 if seconds <= 1 else math.ceil(math.log(seconds) / LOG_GAMMA)
+                entry = buckets.setdefault((resolved_at.date(), office_id or 0, type_id or 0, index), [0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds
+            after = rows[-1].incident_id
+    rows = [
+        {"day": day, "office_id": office_id, "type_id": type_id, "bin": index,
+         "resolved_count": count, "total_seconds": seconds}
+        for (day, office_id, type_id, index), (count, seconds) in sorted(buckets.items())
+    ]
+    for start in range(0, len(rows), CHUNK_ROWS):
+        bind.execute(resolution_stat.insert(), rows[start:start + CHUNK_ROWS])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    created = create_table_if_missing(
+        "resolution_stat",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("office_id", sa.Integer(), primary_key=True),
+        sa.Column("type_id", sa.Integer(), primary_key=True),
+        sa.Column("bin", sa.Integer(), primary_key=True),
+        sa.Column("resolved_count", sa.Integer(), nullable=False),
+        sa.Column("total_seconds", sa.Float(), nullable=False),
+    )
+    if created:
+        backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("resolution_stat")
@@ -0,0 +1,45 @@
+"""job_outbox for background jobs
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 09:35:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations.helpers import create_index_if_missing, create_table_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_table_if_missing(
+        "job_outbox",
+        sa.Column("job_id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("run_after", sa.TIMESTAMP(), nullable=False),
+        sa.Column("locked_until", sa.TIMESTAMP()),
+        sa.Column("failed_at", sa.TIMESTAMP()),
+        sa.Column("last_error", sa.Text()),
+    )
+    pending = sa.text("failed_at IS NULL")
+    create_index_if_missing(
+        "ix_job_outbox_pending_run_after", "job_outbox", ["run_after", "job_id"],
+        postgresql_where=pending, sqlite_where=pending,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("job_outbox")
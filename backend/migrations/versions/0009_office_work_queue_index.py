@@ -0,0 +1,34 @@
+"""Partial index on unassigned incidents by status and office for the work queue
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 09:40:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations.helpers import create_index_if_missing
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    unassigned = sa.text("resolver_id IS NULL")
+    create_index_if_missing(
+        "ix_incident_unassigned_status_office_opened_at_id", "incident",
+        ["status_id", "office_id", "opened_at", "incident_id"],
+        postgresql_where=unassigned, sqlite_where=unassigned,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_incident_unassigned_status_office_opened_at_id", table_name="incident")
@@ -0,0 +1,51 @@
+"""change_seq columns ordering the delta sync feed by commit
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 10:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations.helpers import create_index_if_missing, has_column, has_index, is_postgres
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = {"user": "user_id", "incident": "incident_id", "tombstone": "tombstone_id"}
+# Indexes the timestamp keyset used before
+STAMP_INDEXES = {
+    "user": ("ix_user_updated_at_id", ["updated_at", "user_id"]),
+    "incident": ("ix_incident_updated_at_id", ["updated_at", "incident_id"]),
+    "tombstone": ("ix_tombstone_deleted_at_id", ["deleted_at", "tombstone_id"]),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, key in SYNCED_TABLES.items():
+        if not has_column(table, "change_seq"):
+            # Existing rows sort before every new write; watermarks issued before this
+            # revision no longer decode, so clients start over with a full sync
+            op.add_column(table, sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0"))
+            if is_postgres():
+                op.alter_column(table, "change_seq", server_default=None)
+        create_index_if_missing(f"ix_{table}_change_seq_id", table, ["change_seq", key])
+        name, _ = STAMP_INDEXES[table]
+        if has_index(table, name):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SYNCED_TABLES:
+        name, columns = STAMP_INDEXES[table]
+        create_index_if_missing(name, table, columns)
+        op.drop_index(f"ix_{table}_change_seq_id", table_name=table)
+        op.drop_column(table, "change_seq")
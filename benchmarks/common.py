@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SQLITE_URL = "sqlite+aiosqlite:///bench.sqlite3"
+
+def configure_database(url: str = None):
+    # Must run before backend.main is imported: the engine is built from DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = url or os.getenv("BENCH_DATABASE_URL", SQLITE_URL)
+    os.environ.setdefault("DB_ECHO", "false")
+    return os.environ["DATABASE_URL"]
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(latencies_ms, errors: int, elapsed: float) -> dict:
+    if not latencies_ms:
+        return {"count": 0, "errors": errors}
+    return {
+        "count": len(latencies_ms),
+        "errors": errors,
+        "throughput_rps": round(len(latencies_ms) / elapsed, 2),
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms), 2),
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
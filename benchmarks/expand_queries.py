@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from benchmarks.common import configure_database
+from benchmarks.seed import Scale, BENCH_PASSWORD, ADMIN_EMAIL, seed
+
+# Checks that ?expand= costs a fixed number of queries whatever the page size.
+# Exits non-zero if any expansion's query count grows with the number of rows.
+
+PAGE_SIZES = (1, 50, 500)
+EXPANSIONS = ("", "status", "reporter,resolver", "office,device", "history", "status,reporter,resolver,office,device,history")
+
+async def count_queries(client, path: str, params: dict) -> int:
+    from backend.app import metrics
+
+    route = metrics.routes.get(("GET", path))
+    before = route.queries.total if route else 0
+    response = await client.get(path.replace("{incident_id}", "1"), params=params)
+    response.raise_for_status()
+    return int(metrics.routes[("GET", path)].queries.total - before)
+
+async def run(args) -> dict:
+    import httpx
+
+    await seed(Scale(offices=5, users=50, devices=100, incidents=max(PAGE_SIZES), history_per_incident=3))
+
+    from backend.main import app
+    from app import database
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/login/", json={"email": ADMIN_EMAIL, "password": BENCH_PASSWORD})
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        # Warm the user cache so the auth lookup does not show up in the counts
+        await client.get("/me/")
+
+        for expand in EXPANSIONS:
+            params = {"expand": expand} if expand else {}
+            counts = {
+                limit: await count_queries(client, "/incidents/", dict(params, limit=limit))
+                for limit in PAGE_SIZES
+            }
+            counts["detail"] = await count_queries(client, "/incidents/{incident_id}", params)
+            results[expand or "(none)"] = counts
+    await database.engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Query counts for GET /incidents/?expand=")
+    parser.add_argument("--database-url", help="defaults to BENCH_DATABASE_URL or a local SQLite file")
+    args = parser.parse_args()
+    configure_database(args.database_url)
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    growing = [name for name, counts in results.items() if len({counts[limit] for limit in PAGE_SIZES}) > 1]
+    if growing:
+        print(f"Query count depends on page size for: {', '.join(growing)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
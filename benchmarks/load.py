@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+from benchmarks.common import configure_database, summarize, git_revision
+from benchmarks.seed import Scale, BENCH_PASSWORD, ADMIN_EMAIL, user_email, seed
+
+# Drives a weighted mix of API calls against the app in-process (no network)
+# and reports throughput and latency percentiles per action as JSON.
+
+MIX = {
+    "login": 5,
+    "dashboard": 10,
+    "list_incidents": 40,
+    "create_incident": 10,
+    "update_incident": 15,
+    "stats": 10,
+    "history": 10,
+}
+
+class VirtualUser:
+    def __init__(self, client, token: str, scale: Scale, rng: random.Random):
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.scale = scale
+        self.rng = rng
+        self.cursor = None
+        self.filters = {}
+        self.recent_ids = []
+
+    def incident_id(self) -> int:
+        if self.recent_ids and self.rng.random() < 0.3:
+            return self.rng.choice(self.recent_ids)
+        return self.rng.randint(1, self.scale.incidents)
+
+    async def login(self):
+        return await self.client.post("/login/", json={
+            "email": user_email(self.rng.randrange(self.scale.users)), "password": BENCH_PASSWORD,
+        })
+
+    async def dashboard(self):
+        return await self.client.get("/dashboard/bootstrap", headers=self.headers)
+
+    async def list_incidents(self):
+        # Follow the cursor for a few pages, then start over with new filters
+        if self.cursor is None or self.rng.random() < 0.25:
+            choice = self.rng.random()
+            self.filters = (
+                {"status_id": self.rng.randint(1, 4)} if choice < 0.4
+                else {"office_id": self.rng.randint(1, self.scale.offices)} if choice < 0.6
+                else {}
+            )
+            self.cursor = None
+        params = dict(self.filters, limit=50)
+        if self.cursor:
+            params["after"] = self.cursor
+        response = await self.client.get("/incidents/", params=params, headers=self.headers)
+        if response.status_code == 200:
+            self.cursor = response.json()["next_cursor"]
+        return response
+
+    async def create_incident(self):
+        response = await self.client.post("/incidents/", headers=self.headers, json={
+            "description": "Incidencia de carga",
+            "status_id": 1,
+            "reporter_id": self.rng.randint(1, self.scale.users),
+            "office_id": self.rng.randint(1, self.scale.offices),
+            "device_id": self.rng.randint(1, self.scale.devices),
+        })
+        if response.status_code == 200:
+            self.recent_ids = (self.recent_ids + [response.json()["incident_id"]])[-20:]
+        return response
+
+    async def update_incident(self):
+        return await self.client.put(
+            f"/incidents/{self.incident_id()}",
+            headers=self.headers,
+            json={"status_id": self.rng.randint(1, 4), "comment": "Cambio de carga"},
+        )
+
+    async def stats(self):
+        return await self.client.get("/incidents/stats", headers=self.headers)
+
+    async def history(self):
+        return await self.client.get(f"/incidents/{self.incident_id()}/history", headers=self.headers)
+
+async def run_mix(client, token: str, scale: Scale, args) -> dict:
+    actions = list(MIX)
+    weights = [MIX[action] for action in actions]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + args.duration
+
+    async def worker(index):
+        rng = random.Random(args.seed + index)
+        user = VirtualUser(client, token, scale, rng)
+        while time.perf_counter() < deadline:
+            action = rng.choices(actions, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await getattr(user, action)()
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            if failed:
+                errors[action] += 1
+            else:
+                latencies[action].append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for samples in latencies.values() for value in samples]
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "total": summarize(all_latencies, sum(errors.values()), elapsed),
+        "endpoints": {
+            action: summarize(latencies[action], errors[action], elapsed) for action in actions
+        },
+    }
+
+async def run(args) -> dict:
+    import httpx
+
+    scale = Scale.from_args(args)
+    if not args.skip_seed:
+        await seed(scale, args.seed)
+
+    from backend.main import app
+    from app import database
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        response = await client.post("/login/", json={"email": ADMIN_EMAIL, "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        results = await run_mix(client, response.json()["access_token"], scale, args)
+    pool = database.pool_stats()
+    await database.engine.dispose()
+
+    return {
+        "revision": git_revision(),
+        "database": database.engine.dialect.name,
+        "scale": scale.__dict__,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "mix": MIX,
+        "pool": pool,
+        **results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load benchmark for the Incidens API")
+    parser.add_argument("--database-url", help="defaults to BENCH_DATABASE_URL or a local SQLite file")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse a dataset loaded with benchmarks.seed")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    Scale.add_arguments(parser)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.out:
+        with open(args.out, "w") as handle:
+            handle.write(report + "\n")
+    print(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.common import percentile
+from backend.main import app
+from app import models
+from app.database import Base, get_db
+from backend.app import auth
+
+# Measures latency of /health while a burst of /login/ calls runs on the same
+# event loop. --blocking restores the old inline bcrypt verification.
+
+async def setup_database():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as db:
+        role = models.UserRole(name="admin")
+        db.add(role)
+        await db.flush()
+        db.add(models.User(
+            first_name="Bench",
+            last_name="Bench",
+            email="bench@incidens.com",
+            password_hash=auth.hash_password("bench"),
+            role_id=role.role_id,
+        ))
+        await db.commit()
+    return engine
+
+async def login_storm(client, stop, concurrency):
+    async def worker():
+        while not stop.is_set():
+            await client.post("/login/", json={"email": "bench@incidens.com", "password": "bench"})
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+async def probe(client, stop, interval):
+    # Latency is measured from the scheduled send time, so time spent waiting
+    # for a blocked event loop counts against the request
+    latencies = []
+    scheduled = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        await client.get("/health")
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+        scheduled = max(scheduled + interval, time.perf_counter())
+    return latencies
+
+async def run(args):
+    if args.blocking:
+        async def blocking_verify(plain_password, hashed_password):
+            return auth.verify_password(plain_password, hashed_password)
+        auth.verify_password_async = blocking_verify
+
+    engine = await setup_database()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        storm = asyncio.create_task(login_storm(client, stop, args.concurrency))
+        probes = asyncio.create_task(probe(client, stop, args.interval))
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await storm
+        latencies = await probes
+    await engine.dispose()
+
+    return {
+        "mode": "blocking" if args.blocking else "offloaded",
+        "password_workers": auth.PASSWORD_HASH_WORKERS,
+        "login_concurrency": args.concurrency,
+        "health_requests": len(latencies),
+        "health_p50_ms": round(statistics.median(latencies), 2),
+        "health_p99_ms": round(percentile(latencies, 99), 2),
+        "health_max_ms": round(max(latencies), 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Unrelated-endpoint latency during a login storm")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--blocking", action="store_true", help="verify passwords inline on the event loop")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+
+from benchmarks.common import configure_database, git_revision, summarize
+from benchmarks.seed import Scale, BENCH_PASSWORD, seed, user_email
+
+# Many technicians drain the work queue at once through POST /queue/claim. Every open
+# incident must end up claimed exactly once, by the technician whose call returned it.
+# Exits non-zero on a double assignment, a lost incident or a failed claim.
+
+async def claimer(client, token: str, claims: list, latencies: list, errors: Counter):
+    headers = {"Authorization": f"Bearer {token}"}
+    while True:
+        started = time.perf_counter()
+        response = await client.post("/queue/claim", headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code == 404:
+            return
+        if response.status_code != 200:
+            errors[response.status_code] += 1
+            continue
+        claims.append(response.json())
+
+async def run(args) -> dict:
+    import httpx
+    from sqlalchemy import func
+    from sqlalchemy.future import select
+
+    scale = Scale(offices=args.offices, users=args.claimers * 5 + 1, devices=500, incidents=args.incidents, history_per_incident=0)
+    await seed(scale, args.seed)
+
+    from backend.main import app
+    from app import database, models
+    from backend.app import metrics
+
+    queued = models.Incident.status_id == 1, models.Incident.resolver_id.is_(None)
+    async with database.AsyncSessionLocal() as db:
+        expected = set((await db.execute(select(models.Incident.incident_id).filter(*queued))).scalars())
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        # user1..userN are technicians in the seeded data
+        tokens = {}
+        for index in range(1, args.claimers + 1):
+            response = await client.post("/login/", json={"email": user_email(index), "password": BENCH_PASSWORD})
+            response.raise_for_status()
+            tokens[index + 1] = response.json()["access_token"]
+
+        claims = {user_id: [] for user_id in tokens}
+        latencies, errors = [], Counter()
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            claimer(client, token, claims[user_id], latencies, errors) for user_id, token in tokens.items()
+        ))
+        elapsed = time.perf_counter() - started
+
+    claimed = Counter(incident["incident_id"] for incidents in claims.values() for incident in incidents)
+    wrong_owner = [
+        incident["incident_id"]
+        for user_id, incidents in claims.items()
+        for incident in incidents
+        if incident["resolver_id"] != user_id
+    ]
+    async with database.AsyncSessionLocal() as db:
+        left = await db.scalar(select(func.count()).select_from(models.Incident).filter(*queued))
+        owners = dict((await db.execute(
+            select(models.Incident.incident_id, models.Incident.resolver_id)
+            .filter(models.Incident.incident_id.in_(list(expected)))
+        )).all()) if expected else {}
+    await database.engine.dispose()
+
+    # Time spent inside database calls; it stays flat if claimers are not queueing on locks
+    route = metrics.routes[("POST", "/queue/claim")]
+    winners = {incident["incident_id"]: user_id for user_id, incidents in claims.items() for incident in incidents}
+    return {
+        "revision": git_revision(),
+        "database": database.engine.dialect.name,
+        "claimers": args.claimers,
+        "queued": len(expected),
+        "claimed": sum(claimed.values()),
+        "claims_per_s": round(sum(claimed.values()) / elapsed, 2),
+        "latency": summarize(latencies, sum(errors.values()), elapsed),
+        "db_ms_per_claim": round(route.db_time / route.latency.count * 1000, 2),
+        "errors": dict(errors),
+        "double_assigned": sorted(incident_id for incident_id, count in claimed.items() if count > 1),
+        "missing": sorted(expected - set(claimed)),
+        "unexpected": sorted(set(claimed) - expected),
+        "wrong_owner": sorted(wrong_owner + [
+            incident_id for incident_id, user_id in winners.items() if owners.get(incident_id) != user_id
+        ]),
+        "left_in_queue": left,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent stress test for POST /queue/claim")
+    parser.add_argument("--database-url", help="defaults to BENCH_DATABASE_URL or a local SQLite file")
+    parser.add_argument("--claimers", type=int, default=32)
+    parser.add_argument("--incidents", type=int, default=5000)
+    parser.add_argument("--offices", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    problems = ("double_assigned", "missing", "unexpected", "wrong_owner", "errors", "left_in_queue")
+    if any(report[name] for name in problems):
+        print("Work queue stress test failed", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
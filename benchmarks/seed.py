@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_database
+
+@dataclass
+class Scale:
+    offices: int = 20
+    users: int = 2000
+    devices: int = 5000
+    incidents: int = 10000
+    history_per_incident: int = 2
+
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser):
+        for name, default in cls().__dict__.items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+
+    @classmethod
+    def from_args(cls, args) -> "Scale":
+        return cls(**{name: getattr(args, name) for name in cls().__dict__})
+
+BENCH_PASSWORD = "bench"
+ADMIN_EMAIL = "user0@bench-incidens.com"
+CHUNK_ROWS = 10000
+# Status ids as seeded by init_db.seed_reference_data: open, in_progress, resolved, closed
+STATUS_WEIGHTS = {1: 30, 2: 15, 3: 35, 4: 20}
+
+def user_email(index: int) -> str:
+    return f"user{index}@bench-incidens.com"
+
+# ========================
+# BULK LOADER
+# ========================
+
+async def bulk_insert(conn, table, rows):
+    if not rows:
+        return
+    columns = list(rows[0])
+    if conn.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=[tuple(row[c] for c in columns) for row in rows], columns=columns
+        )
+    else:
+        await conn.execute(table.insert(), rows)
+
+async def insert_chunked(engine, table, row_factory, count: int):
+    for start in range(0, count, CHUNK_ROWS):
+        rows = [row_factory(index) for index in range(start, min(start + CHUNK_ROWS, count))]
+        async with engine.begin() as conn:
+            await bulk_insert(conn, table, rows)
+
+async def reset_sequences(engine, tables):
+    if engine.dialect.name != "postgresql":
+        return
+    from sqlalchemy import text
+    async with engine.begin() as conn:
+        for table in tables:
+            pk = list(table.primary_key.columns)[0].name
+            await conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', '{pk}'), "
+                f"COALESCE((SELECT MAX({pk}) FROM \"{table.name}\"), 1))"
+            ))
+
+# ========================
+# SYNTHETIC DATASET
+# ========================
+
+async def seed(scale: Scale, seed_value: int = 42):
+    from backend.main import app  # noqa: F401  (puts backend/ on sys.path)
+    from app import database, models, crud
+    from backend.app import analytics, auth
+
+    rng = random.Random(seed_value)
+    engine = database.engine
+    async with engine.begin() as conn:
+        await conn.run_sync(database.Base.metadata.drop_all)
+        await conn.run_sync(database.Base.metadata.create_all)
+
+    async with engine.begin() as conn:
+        await bulk_insert(conn, models.UserRole.__table__, [
+            {"role_id": 1, "name": "admin"}, {"role_id": 2, "name": "technician"}, {"role_id": 3, "name": "user"},
+        ])
+        await bulk_insert(conn, models.IncidentStatus.__table__, [
+            {"status_id": 1, "name": "open"}, {"status_id": 2, "name": "in_progress"},
+            {"status_id": 3, "name": "resolved"}, {"status_id": 4, "name": "closed"},
+        ])
+        await bulk_insert(conn, models.DeviceType.__table__, [
+            {"type_id": index + 1, "name": name}
+            for index, name in enumerate(("laptop", "desktop", "printer", "phone"))
+        ])
+
+    password_hash = auth.hash_password(BENCH_PASSWORD)
+    technicians = max(1, scale.users // 5)
+    now = datetime.utcnow().replace(microsecond=0)
+    span_minutes = 2 * 365 * 24 * 60
+
+    await insert_chunked(engine, models.Office.__table__, lambda i: {
+        "office_id": i + 1, "city": f"Office {i + 1}",
+    }, scale.offices)
+    await insert_chunked(engine, models.User.__table__, lambda i: {
+        "user_id": i + 1,
+        "office_id": rng.randint(1, scale.offices),
+        "first_name": "Bench",
+        "last_name": f"User {i}",
+        "email": user_email(i),
+        "password_hash": password_hash,
+        # user0 is the admin, the next fifth are technicians
+        "role_id": 1 if i == 0 else 2 if i <= technicians else 3,
+        "updated_at": now,
+    }, scale.users)
+    await insert_chunked(engine, models.Device.__table__, lambda i: {
+        "device_id": i + 1,
+        "office_id": rng.randint(1, scale.offices),
+        "owner_id": rng.randint(1, scale.users),
+        "type_id": rng.randint(1, 4),
+    }, scale.devices)
+
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+
+    def incident_row(i):
+        opened_at = now - timedelta(minutes=rng.randrange(span_minutes))
+        status_id = rng.choices(statuses, weights)[0]
+        resolved = status_id in (3, 4)
+        resolved_at = opened_at + timedelta(minutes=rng.randint(5, 14 * 24 * 60)) if resolved else None
+        return {
+            "incident_id": i + 1,
+            "opened_at": opened_at,
+            "status_id": status_id,
+            "description": f"Incidencia sintética {i}: {rng.choice(('impresora', 'portátil', 'red', 'pantalla', 'teléfono'))} no funciona",
+            "reporter_id": rng.randint(1, scale.users),
+            "resolver_id": rng.randint(2, technicians + 1) if status_id != 1 else None,
+            "office_id": rng.randint(1, scale.offices),
+            "device_id": rng.randint(1, scale.devices) if rng.random() < 0.8 else None,
+            "resolved_at": resolved_at,
+            "updated_at": min(resolved_at or opened_at, now),
+        }
+
+    await insert_chunked(engine, models.Incident.__table__, incident_row, scale.incidents)
+
+    def history_row(i):
+        incident_id = i // scale.history_per_incident + 1
+        step = i % scale.history_per_incident
+        return {
+            "history_id": i + 1,
+            "incident_id": incident_id,
+            "status_id": min(step + 1, 4),
+            "date": now - timedelta(minutes=span_minutes - step * 60),
+            "comment": None,
+        }
+
+    await insert_chunked(engine, models.IncidentHistory.__table__, history_row, scale.incidents * scale.history_per_incident)
+
+    await reset_sequences(engine, [
+        models.Office.__table__, models.User.__table__, models.Device.__table__,
+        models.Incident.__table__, models.IncidentHistory.__table__,
+    ])
+    async with database.AsyncSessionLocal() as db:
+        await crud.rebuild_incident_stats(db)
+        await analytics.rebuild_resolution_stats(db)
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic Incidens dataset")
+    parser.add_argument("--database-url", help="defaults to BENCH_DATABASE_URL or a local SQLite file")
+    Scale.add_arguments(parser)
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(seed(Scale.from_args(args)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import configure_database, git_revision
+from benchmarks.seed import Scale, seed
+
+# Rows/sec for the incident list body, built the old way (ORM objects validated through
+# the response_model) and the fast way (column tuples encoded by orjson). The query and
+# the encoding are timed separately so the split between database and Python is visible.
+
+async def orm_path(session, limit: int):
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from sqlalchemy.future import select
+    from typing import List
+    from backend.app import models, schemas
+
+    adapter = TypeAdapter(List[schemas.IncidentResponse])
+    started = time.perf_counter()
+    result = await session.execute(select(models.Incident).order_by(models.Incident.incident_id).limit(limit))
+    incidents = result.scalars().all()
+    queried = time.perf_counter()
+    # What FastAPI does with a response_model: validate, dump to JSON-able data, json.dumps
+    content = adapter.dump_python(adapter.validate_python(incidents, from_attributes=True), mode="json")
+    body = JSONResponse(content).body
+    return len(incidents), queried - started, time.perf_counter() - queried, len(body)
+
+async def row_path(session, limit: int):
+    from backend.app.responses import OrjsonResponse
+    from sqlalchemy.future import select
+    from backend.app import crud, models
+
+    started = time.perf_counter()
+    result = await session.execute(select(*crud.INCIDENT_ROW_COLUMNS).order_by(models.Incident.incident_id).limit(limit))
+    incidents = crud.row_dicts(result)
+    queried = time.perf_counter()
+    body = OrjsonResponse(incidents).body
+    return len(incidents), queried - started, time.perf_counter() - queried, len(body)
+
+PATHS = {"orm_pydantic": orm_path, "columns_orjson": row_path}
+
+async def measure(path, rows: int, repeats: int) -> dict:
+    from app import database
+
+    runs = []
+    for _ in range(repeats):
+        async with database.AsyncSessionLocal() as session:
+            runs.append(await path(session, rows))
+    # Best run: the least disturbed by GC pauses and other noise on the machine
+    count, query_s, encode_s, size = min(runs, key=lambda run: run[1] + run[2])
+    return {
+        "rows": count,
+        "body_bytes": size,
+        "query_ms": round(query_s * 1000, 1),
+        "encode_ms": round(encode_s * 1000, 1),
+        "rows_per_s": round(count / (query_s + encode_s)),
+        "encode_rows_per_s": round(count / encode_s) if encode_s else None,
+    }
+
+async def run(args) -> dict:
+    if not args.skip_seed:
+        await seed(Scale(offices=20, users=500, devices=1000, incidents=args.rows, history_per_incident=0))
+
+    from app import database
+
+    results = {name: await measure(path, args.rows, args.repeats) for name, path in PATHS.items()}
+    await database.engine.dispose()
+
+    before, after = results["orm_pydantic"], results["columns_orjson"]
+    return {
+        "revision": git_revision(),
+        "database": database.engine.dialect.name,
+        "repeats": args.repeats,
+        **results,
+        "speedup": round(after["rows_per_s"] / before["rows_per_s"], 2),
+        "encode_speedup": round(after["encode_rows_per_s"] / before["encode_rows_per_s"], 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization throughput of the incident list")
+    parser.add_argument("--database-url", help="defaults to BENCH_DATABASE_URL or a local SQLite file")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse a dataset loaded with benchmarks.seed")
+    args = parser.parse_args()
+    configure_database(args.database_url)
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
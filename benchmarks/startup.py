@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import configure_database, git_revision, percentile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READY_LINE = "Application startup complete"
+
+# Time from launching uvicorn with several workers to the first request answered from the
+# database, and to every worker reporting ready. The per-worker startup work is also timed
+# in-process: the schema version check against the create_all + seed/admin lookups it replaced.
+
+def prepare_database():
+    from backend.app import init_db
+    from scripts.create_admin import create_admin_user
+
+    init_db.upgrade_schema()
+
+    async def bootstrap():
+        await init_db.seed_reference_data()
+        await create_admin_user()
+        await init_db.engine.dispose()
+    asyncio.run(bootstrap())
+
+async def startup_work(repeats: int) -> dict:
+    from sqlalchemy.future import select
+    from backend.app import init_db, models
+    from backend.app.database import Base, AsyncSessionLocal, engine
+
+    async def legacy():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSessionLocal() as db:
+            await db.execute(select(models.UserRole))
+            await db.execute(select(models.User).filter(models.User.email == "admin@admin.com"))
+
+    timings = {"create_all_and_lookups": legacy, "schema_version_check": init_db.check_schema_version}
+    results = {}
+    for name, work in timings.items():
+        samples = []
+        for _ in range(repeats + 1):
+            started = time.perf_counter()
+            await work()
+            samples.append((time.perf_counter() - started) * 1000)
+        # A fresh worker pays the first call; the rest shows the steady cost
+        results[name] = {"first_ms": round(samples[0], 2), "warm_ms": round(min(samples[1:]), 2)}
+    await engine.dispose()
+    return results
+
+def watch_ready(stream, ready_at: list):
+    for line in stream:
+        if READY_LINE in line:
+            ready_at.append(time.perf_counter())
+
+def launch(args, port: int) -> dict:
+    import httpx
+
+    command = [
+        sys.executable, "-m", "uvicorn", "backend.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers), "--log-level", "info",
+    ]
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, cwd=PROJECT_ROOT, env=os.environ.copy(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    ready_at = []
+    threading.Thread(target=watch_ready, args=(process.stderr, ready_at), daemon=True).start()
+
+    first_request = None
+    try:
+        deadline = started + args.timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+            while time.perf_counter() < deadline and process.poll() is None:
+                try:
+                    # Served from the database, so a worker that answers has finished its startup
+                    if client.get("/offices/").status_code == 200:
+                        first_request = time.perf_counter()
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        while len(ready_at) < args.workers and time.perf_counter() < deadline and process.poll() is None:
+            time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return {
+        "first_request_ms": round((first_request - started) * 1000, 1) if first_request else None,
+        "all_workers_ready_ms": round((ready_at[args.workers - 1] - started) * 1000, 1)
+        if len(ready_at) >= args.workers else None,
+    }
+
+def spread(samples_ms, runs: int) -> dict:
+    if not samples_ms:
+        return {"count": 0, "failed": runs}
+    return {
+        "count": len(samples_ms),
+        "failed": runs - len(samples_ms),
+        "min_ms": min(samples_ms),
+        "p50_ms": percentile(samples_ms, 50),
+        "max_ms": max(samples_ms),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first request of a multi-worker uvicorn start")
+    parser.add_argument("--database-url", help="defaults to BENCH_DATABASE_URL or a local SQLite file")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--skip-setup", action="store_true", help="the database is already migrated and seeded")
+    args = parser.parse_args()
+    configure_database(args.database_url)
+
+    if not args.skip_setup:
+        prepare_database()
+
+    runs = [launch(args, args.port) for _ in range(args.runs)]
+    first = [run["first_request_ms"] for run in runs if run["first_request_ms"] is not None]
+    ready = [run["all_workers_ready_ms"] for run in runs if run["all_workers_ready_ms"] is not None]
+    report = {
+        "revision": git_revision(),
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+        "workers": args.workers,
+        "runs": runs,
+        "first_request": spread(first, args.runs),
+        "all_workers_ready": spread(ready, args.runs),
+        "startup_work_ms": asyncio.run(startup_work(args.runs)),
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -46,6 +46,30 @@ interface IncidentStatus {
   name: string;
 }
 
+interface IncidentPage {
+  items: Incident[];
+  next_cursor: string | null;
+}
+
+interface IncidentStatsGroup {
+  id?: number;
+  count: number;
+}
+
+interface IncidentStats {
+  total: number;
+  by_status: IncidentStatsGroup[];
+  by_office: IncidentStatsGroup[];
+  by_device_type: IncidentStatsGroup[];
+}
+
+interface ChangeEvent<T> {
+  entity: 'incident' | 'user' | 'resync';
+  action: 'created' | 'updated' | 'deleted' | 'imported' | 'archived' | 'bulk_updated' | 'bulk_deleted' | 'resync';
+  id: number | null;
+  data: Partial<T> | null;
+}
+
 interface UserFormData {
   first_name: string;
   last_name: string;
@@ -66,6 +90,9 @@ interface IncidentFormData {
 const AdminDashboard: React.FC = () => {
   const [users, setUsers] = useState<User[]>([]);
   const [incidents, setIncidents] = useState<Incident[]>([]);
+  const [incidentsCursor, setIncidentsCursor] = useState<string | null>(null);
+  const [loadingMoreIncidents, setLoadingMoreIncidents] = useState(false);
+  const [incidentStats, setIncidentStats] = useState<IncidentStats | null>(null);
   const [offices, setOffices] = useState<Office[]>([]);
   const [userRoles, setUserRoles] = useState<UserRole[]>([]);
   const [incidentStatuses, setIncidentStatuses] = useState<IncidentStatus[]>([]);
@@ -143,48 +170,98 @@ const AdminDashboard: React.FC = () => {
     };
   };
 
+  const countByStatus = (statusId: number) =>
+    incidentStats?.by_status.find(group => group.id === statusId)?.count ?? 0;
+
   useEffect(() => {
     fetchDashboardData();
+
+    // EventSource cannot send headers, so the token travels as a query parameter
+    const token = localStorage.getItem('token');
+    const source = new EventSource(`http://localhost:8000/events?token=${encodeURIComponent(token ?? '')}`);
+    let disconnected = false;
+
+    source.addEventListener('incident', (event) => applyIncidentEvent(JSON.parse((event as MessageEvent).data)));
+    source.addEventListener('user', (event) => applyUserEvent(JSON.parse((event as MessageEvent).data)));
+    source.addEventListener('resync', () => fetchDashboardData());
+    source.onerror = () => {
+      disconnected = true;
+    };
+    source.onopen = () => {
+      // Changes made while the stream was down were not delivered
+      if (disconnected) {
+        disconnected = false;
+        fetchDashboardData();
+      }
+    };
+
+    return () => source.close();
   }, []);
 
+  const fetchIncidentStats = async () => {
+    try {
+      const token = localStorage.getItem('token');
+      const response = await fetch('http://localhost:8000/incidents/stats', {
+        credentials: 'include',
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+
+      if (response.ok) {
+        setIncidentStats(await response.json());
+      }
+    } catch (error) {
+      console.error('Error fetching stats:', error);
+    }
+  };
+
+  const applyIncidentEvent = (event: ChangeEvent<Incident>) => {
+    // Events that cover many incidents at once carry no row data; reload instead
+    const reloadActions = ['imported', 'archived', 'bulk_updated', 'bulk_deleted'];
+    if (reloadActions.includes(event.action) || (event.action !== 'deleted' && !event.data)) {
+      fetchDashboardData();
+      return;
+    }
+
+    if (event.action === 'deleted') {
+      setIncidents(prev => prev.filter(incident => incident.incident_id !== event.id));
+    } else if (event.action === 'created') {
+      setIncidents(prev => prev.some(incident => incident.incident_id === event.id) ? prev : [event.data as Incident, ...prev]);
+    } else {
+      setIncidents(prev => prev.map(incident => incident.incident_id === event.id ? { ...incident, ...event.data } : incident));
+    }
+    fetchIncidentStats();
+  };
+
+  const applyUserEvent = (event: ChangeEvent<User>) => {
+    if (event.action === 'deleted') {
+      setUsers(prev => prev.filter(user => user.user_id !== event.id));
+    } else if (event.action === 'created') {
+      setUsers(prev => prev.some(user => user.user_id === event.id) ? prev : [...prev, event.data as User]);
+    } else {
+      setUsers(prev => prev.map(user => user.user_id === event.id ? { ...user, ...event.data } : user));
+    }
+  };
+
   const fetchDashboardData = async () => {
     try {
       const token = localStorage.getItem('token');
       
-      const [
-        usersResponse, 
-        incidentsResponse, 
-        officesResponse, 
-        rolesResponse, 
-        statusesResponse,
-        deviceTypesResponse
-      ] = await Promise.all([
-        fetch('http://localhost:8000/users/', {
-          headers: { 'Authorization': `Bearer ${token}` }
-        }),
-        fetch('http://localhost:8000/incidents/', {
-          headers: { 'Authorization': `Bearer ${token}` }
-        }),
-        fetch('http://localhost:8000/offices/', {
-          headers: { 'Authorization': `Bearer ${token}` }
-        }),
-        fetch('http://localhost:8000/user-roles/', {
-          headers: { 'Authorization': `Bearer ${token}` }
-        }),
-        fetch('http://localhost:8000/incident-statuses/', {
-          headers: { 'Authorization': `Bearer ${token}` }
-        }),
-        fetch('http://localhost:8000/device-types/', {
-          headers: { 'Authorization': `Bearer ${token}` }
-        })
-      ]);
-
-      if (usersResponse.ok) setUsers(await usersResponse.json());
-      if (incidentsResponse.ok) setIncidents(await incidentsResponse.json());
-      if (officesResponse.ok) setOffices(await officesResponse.json());
-      if (rolesResponse.ok) setUserRoles(await rolesResponse.json());
-      if (statusesResponse.ok) setIncidentStatuses(await statusesResponse.json());
-      if (deviceTypesResponse.ok) setDeviceTypes(await deviceTypesResponse.json());
+      const response = await fetch('http://localhost:8000/dashboard/bootstrap', {
+        credentials: 'include',
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+
+      if (response.ok) {
+        const data = await response.json();
+        setUsers(data.users ?? []);
+        setIncidents(data.incidents.items);
+        setIncidentsCursor(data.incidents.next_cursor ?? null);
+        setIncidentStats(data.stats);
+        setOffices(data.offices);
+        setUserRoles(data.user_roles);
+        setIncidentStatuses(data.incident_statuses);
+        setDeviceTypes(data.device_types);
+      }
 
       setLoading(false);
     } catch (error) {
@@ -193,10 +270,38 @@ const AdminDashboard: React.FC = () => {
     }
   };
 
+  const fetchMoreIncidents = async () => {
+    if (!incidentsCursor || loadingMoreIncidents) return;
+
+    setLoadingMoreIncidents(true);
+    try {
+      const token = localStorage.getItem('token');
+      const response = await fetch(`http://localhost:8000/incidents/?after=${encodeURIComponent(incidentsCursor)}`, {
+        credentials: 'include',
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+
+      if (response.ok) {
+        const page: IncidentPage = await response.json();
+        // Incidents created after the first page already arrived through the event stream
+        setIncidents(prev => [
+          ...prev,
+          ...page.items.filter(item => !prev.some(incident => incident.incident_id === item.incident_id))
+        ]);
+        setIncidentsCursor(page.next_cursor);
+      }
+    } catch (error) {
+      console.error('Error fetching incidents:', error);
+    } finally {
+      setLoadingMoreIncidents(false);
+    }
+  };
+
   const createUser = async (userData: Partial<User>) => {
     try {
       const token = localStorage.getItem('token');
       const response = await fetch('http://localhost:8000/users/', {
+        credentials: 'include',
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -206,7 +311,6 @@ const AdminDashboard: React.FC = () => {
       });
 
       if (response.ok) {
-        fetchDashboardData();
         setShowUserModal(false);
         resetUserForm();
         setCurrentPage(1); // Volver a la primera página después de agregar un usuario
@@ -220,6 +324,7 @@ const AdminDashboard: React.FC = () => {
     try {
       const token = localStorage.getItem('token');
       const response = await fetch(`http://localhost:8000/users/${userId}`, {
+        credentials: 'include',
         method: 'PUT',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -229,7 +334,6 @@ const AdminDashboard: React.FC = () => {
       });
 
       if (response.ok) {
-        fetchDashboardData();
         setShowUserModal(false);
         setEditingUser(null);
       }
@@ -244,6 +348,7 @@ const AdminDashboard: React.FC = () => {
     try {
       const token = localStorage.getItem('token');
       const response = await fetch(`http://localhost:8000/users/${userId}`, {
+        credentials: 'include',
         method: 'DELETE',
         headers: {
           'Authorization': `Bearer ${token}`
@@ -251,7 +356,6 @@ const AdminDashboard: React.FC = () => {
       });
 
       if (response.ok) {
-        fetchDashboardData();
         // Si eliminamos el último usuario de la página, retroceder una página
         if (currentUsers.length === 1 && currentPage > 1) {
           setCurrentPage(currentPage - 1);
@@ -266,6 +370,7 @@ const AdminDashboard: React.FC = () => {
     try {
       const token = localStorage.getItem('token');
       const response = await fetch('http://localhost:8000/incidents/', {
+        credentials: 'include',
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -275,7 +380,6 @@ const AdminDashboard: React.FC = () => {
       });
 
       if (response.ok) {
-        fetchDashboardData();
         setShowIncidentModal(false);
         resetIncidentForm();
       }
@@ -288,6 +392,7 @@ const AdminDashboard: React.FC = () => {
     try {
       const token = localStorage.getItem('token');
       const response = await fetch(`http://localhost:8000/incidents/${incidentId}`, {
+        credentials: 'include',
         method: 'PUT',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -297,7 +402,6 @@ const AdminDashboard: React.FC = () => {
       });
 
       if (response.ok) {
-        fetchDashboardData();
         setShowIncidentModal(false);
         setEditingIncident(null);
       }
@@ -312,14 +416,15 @@ const AdminDashboard: React.FC = () => {
     try {
       const token = localStorage.getItem('token');
       const response = await fetch(`http://localhost:8000/incidents/${incidentId}`, {
+        credentials: 'include',
         method: 'DELETE',
         headers: {
           'Authorization': `Bearer ${token}`
         }
       });
 
-      if (response.ok) {
-        fetchDashboardData();
+      if (!response.ok) {
+        console.error('Error deleting incident:', response.status);
       }
     } catch (error) {
       console.error('Error deleting incident:', error);
@@ -394,15 +499,15 @@ const AdminDashboard: React.FC = () => {
               </div>
               <div className="stat-card">
                 <h3>Total Incidencias</h3>
-                <p className="stat-number">{incidents.length}</p>
+                <p className="stat-number">{incidentStats?.total ?? 0}</p>
               </div>
               <div className="stat-card">
                 <h3>Incidencias Abiertas</h3>
-                <p className="stat-number">{incidents.filter(inc => inc.status_id === 1).length}</p>
+                <p className="stat-number">{countByStatus(1)}</p>
               </div>
               <div className="stat-card">
                 <h3>Incidencias Resueltas</h3>
-                <p className="stat-number">{incidents.filter(inc => inc.status_id === 3).length}</p>
+                <p className="stat-number">{countByStatus(3)}</p>
               </div>
             </div>
           </div>
@@ -530,6 +635,19 @@ const AdminDashboard: React.FC = () => {
                 </div>
               ))}
             </div>
+
+            {/* Paginación por cursor */}
+            {incidentsCursor && (
+              <div className="pagination-container">
+                <button
+                  onClick={fetchMoreIncidents}
+                  disabled={loadingMoreIncidents}
+                  className="pagination-btn"
+                >
+                  {loadingMoreIncidents ? 'Cargando...' : 'Cargar más incidencias'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </main>
@@ -27,6 +27,7 @@ const Login: React.FC = () => {
     
     try {
       const response = await fetch('http://localhost:8000/login/', {
+        credentials: 'include',
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -39,6 +40,7 @@ const Login: React.FC = () => {
         localStorage.setItem('token', data.access_token);
         
         const userResponse = await fetch('http://localhost:8000/me/', {
+          credentials: 'include',
           headers: {
             'Authorization': `Bearer ${data.access_token}`
           }
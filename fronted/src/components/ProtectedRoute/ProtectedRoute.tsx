@@ -19,6 +19,7 @@ const ProtectedRoute: React.FC<ProtectedRouteProps> = ({ children, requiredRole
 
       try {
         const response = await fetch('http://localhost:8000/me/', {
+          credentials: 'include',
           headers: {
             'Authorization': `Bearer ${token}`
           }
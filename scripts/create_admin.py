@@ -27,7 +27,7 @@ async def create_admin_user():
             roles = result.scalars().all()
             
             if not roles:
-                print("No hay roles en la base de datos. Ejecuta primero init_db()")
+                print("No hay roles en la base de datos. Ejecuta primero: python scripts/manage.py seed")
                 return None
             
             admin_role = next((role for role in roles if role.name == "admin"), roles[0])
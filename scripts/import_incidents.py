@@ -0,0 +1,46 @@
+import argparse
+import asyncio
+import json
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.database import AsyncSessionLocal
+from backend.app import bulk_import
+
+async def read_chunks(path: str, chunk_size: int = 1024 * 1024):
+    with open(path, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+
+async def import_incidents(path: str, fmt: str, batch_size: int, errors_path: str = None):
+    async with AsyncSessionLocal() as db:
+        report = await bulk_import.import_incidents(
+            db, read_chunks(path), fmt, batch_size=batch_size, max_errors=sys.maxsize
+        )
+
+    print("Importación terminada")
+    print(f"   Insertadas: {report['inserted']}")
+    print(f"   Con errores: {report['failed']}")
+
+    if errors_path:
+        with open(errors_path, "w", encoding="utf-8") as f:
+            for error in report["errors"]:
+                f.write(json.dumps(error, ensure_ascii=False) + "\n")
+        print(f"   Informe de errores: {errors_path}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa incidencias desde CSV o NDJSON")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=bulk_import.IMPORT_FORMATS)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--errors", help="fichero NDJSON donde escribir las filas rechazadas")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    asyncio.run(import_incidents(args.path, fmt, args.batch_size, args.errors))
+
+if __name__ == "__main__":
+    main()
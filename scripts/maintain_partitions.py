@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.database import AsyncSessionLocal
+from backend.app import partitions
+from backend.app.models import utcnow
+
+async def maintain_partitions(months_ahead: int, archive_after_months: int, batch_size: int, drop_empty: bool):
+    cutoff = partitions.add_months(partitions.month_start(utcnow()), -archive_after_months)
+    async with AsyncSessionLocal() as db:
+        created = await partitions.ensure_partitions(db, months_ahead)
+        if created:
+            print(f"Particiones creadas: {', '.join(created)}")
+
+        archived = await partitions.archive_incidents(db, cutoff, batch_size)
+        print(f"Incidencias archivadas (abiertas antes de {cutoff:%Y-%m-%d}): {archived}")
+
+        if drop_empty:
+            dropped = await partitions.drop_empty_partitions(db, cutoff)
+            if dropped:
+                print(f"Particiones vacías eliminadas: {', '.join(dropped)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Crea particiones mensuales y archiva incidencias cerradas antiguas")
+    parser.add_argument("--months-ahead", type=int, default=3)
+    parser.add_argument("--archive-after-months", type=int, default=partitions.ARCHIVE_AFTER_MONTHS)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--drop-empty", action="store_true", help="Elimina particiones antiguas que quedaron vacías")
+    args = parser.parse_args()
+    asyncio.run(maintain_partitions(args.months_ahead, args.archive_after_months, args.batch_size, args.drop_empty))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app import init_db
+from scripts.create_admin import create_admin_user
+
+# Run once per deploy, not per worker: the API only checks the schema revision at startup
+
+def migrate(args):
+    init_db.upgrade_schema(args.revision)
+    print(f"Esquema en la revisión {asyncio.run(init_db.schema_state())[0]}")
+
+def check(args):
+    async def run():
+        try:
+            print(f"Esquema al día (revisión {await init_db.check_schema_version()})")
+            return 0
+        except RuntimeError as e:
+            print(e)
+            return 1
+        finally:
+            await init_db.engine.dispose()
+    sys.exit(asyncio.run(run()))
+
+def bootstrap(seed: bool, admin: bool):
+    # One event loop for both: they share the application's connection pool
+    async def run():
+        try:
+            if seed:
+                await init_db.seed_reference_data()
+            if admin:
+                await create_admin_user()
+        finally:
+            await init_db.engine.dispose()
+    asyncio.run(run())
+
+def setup(args):
+    migrate(args)
+    bootstrap(seed=True, admin=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Gestión de la base de datos de Incidens")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("migrate", help="Aplica las migraciones pendientes")
+    command.add_argument("--revision", default="head")
+    command.set_defaults(handler=migrate)
+
+    command = commands.add_parser("check", help="Comprueba que el esquema está en la última revisión")
+    command.set_defaults(handler=check)
+
+    command = commands.add_parser("seed", help="Inserta roles, estados y tipos de dispositivo")
+    command.set_defaults(handler=lambda args: bootstrap(seed=True, admin=False))
+
+    command = commands.add_parser("create-admin", help="Crea el usuario administrador si no existe")
+    command.set_defaults(handler=lambda args: bootstrap(seed=False, admin=True))
+
+    command = commands.add_parser("setup", help="migrate + seed + create-admin, para una instalación nueva")
+    command.add_argument("--revision", default="head")
+    command.set_defaults(handler=setup)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.database import AsyncSessionLocal
+from backend.app import crud
+
+async def rebuild_incident_stats():
+    async with AsyncSessionLocal() as db:
+        await crud.rebuild_incident_stats(db)
+        stats = await crud.get_incident_stats(db)
+        print("Estadísticas de incidencias recalculadas")
+        print(f"   Total: {stats['total']}")
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_incident_stats())
@@ -0,0 +1,26 @@
+import argparse
+import asyncio
+import sys
+import os
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.database import AsyncSessionLocal
+from backend.app import analytics
+
+async def rebuild_resolution_stats(since: date = None):
+    async with AsyncSessionLocal() as db:
+        resolved = await analytics.rebuild_resolution_stats(db, since)
+        desde = f" desde {since:%Y-%m-%d}" if since else ""
+        print(f"Tiempos de resolución recalculados{desde}")
+        print(f"   Incidencias resueltas: {resolved}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalcula los buckets diarios de tiempos de resolución")
+    parser.add_argument("--since", type=date.fromisoformat, help="Solo recalcula los días a partir de esta fecha (AAAA-MM-DD)")
+    args = parser.parse_args()
+    asyncio.run(rebuild_resolution_stats(args.since))
+
+if __name__ == "__main__":
+    main()
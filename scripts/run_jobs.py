@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.database import AsyncSessionLocal
+from backend.app import jobs, analytics  # noqa: F401  (registers the job handlers)
+
+async def run_jobs(retry_failed: bool, limit: int):
+    if retry_failed:
+        async with AsyncSessionLocal() as db:
+            print(f"Trabajos fallidos reprogramados: {await jobs.retry_failed_jobs(db)}")
+    completed = await jobs.run_due_jobs(AsyncSessionLocal, limit)
+    print(f"Trabajos completados: {completed}")
+    async with AsyncSessionLocal() as db:
+        await jobs.refresh_outbox_stats(db)
+    print(f"   Pendientes: {jobs.stats.outbox_pending}")
+    print(f"   Fallidos: {jobs.stats.outbox_failed}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta los trabajos pendientes del outbox sin levantar la API")
+    parser.add_argument("--retry-failed", action="store_true", help="Vuelve a programar los trabajos que agotaron sus reintentos")
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run_jobs(args.retry_failed, args.limit))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from backend.app import models
+from backend.app.database import Base, engine_options
+
+# Point this at a scratch Postgres database to run the suite on the production dialect;
+# its tables are dropped and recreated for every test. Unset, each test gets a SQLite file
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# Seeded in this order, so the ids are 1, 2, 3...: the same rows scripts/manage.py seed
+# inserts, two offices, and admin (1), technicians (2: office 1, 3: office 2) and
+# regular users (4: office 1, 5: office 2), with one device per office
+ROLES = ("admin", "technician", "user")
+STATUSES = ("open", "in_progress", "resolved", "closed")
+DEVICE_TYPES = ("laptop", "desktop", "printer", "phone")
+USERS = ((1, 1), (2, 1), (2, 2), (3, 1), (3, 2))
+DEVICES = ((1, 1), (2, 3))
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+async def seed(session_factory):
+    rows = (
+        [models.UserRole(name=name) for name in ROLES]
+        + [models.IncidentStatus(name=name) for name in STATUSES]
+        + [models.DeviceType(name=name) for name in DEVICE_TYPES]
+        + [models.Office(city=city) for city in ("Madrid", "Sevilla")]
+        + [
+            models.User(
+                first_name="Usuario", last_name=str(number), email=f"u{number}@test.com",
+                password_hash="-", role_id=role_id, office_id=office_id,
+            )
+            for number, (role_id, office_id) in enumerate(USERS, 1)
+        ]
+        + [models.Device(office_id=office_id, type_id=type_id) for office_id, type_id in DEVICES]
+    )
+    async with session_factory() as db:
+        for row in rows:
+            db.add(row)
+            await db.flush()
+        await db.commit()
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    url = TEST_DATABASE_URL or f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite3'}"
+    engine = create_async_engine(url, **engine_options(url))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    await seed(factory)
+    yield factory
+    await engine.dispose()
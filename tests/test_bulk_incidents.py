@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from backend.app import crud, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+OPEN, IN_PROGRESS, RESOLVED = 1, 2, 3
+BATCH_SIZE = 3
+# (office, device, status) for incidents 1..11; device 1 sits in office 1, device 2 in office 2
+INCIDENTS = [(1 + number % 2, (None, 1, 2)[number % 3], (OPEN, OPEN, IN_PROGRESS)[number % 3]) for number in range(11)]
+
+@pytest.fixture
+async def incidents(session_factory):
+    async with session_factory() as db:
+        for number, (office_id, device_id, status_id) in enumerate(INCIDENTS):
+            await crud.create_incident(db, schemas.IncidentCreate(
+                description=f"Incidencia {number}", status_id=status_id, reporter_id=4,
+                office_id=office_id, device_id=device_id,
+            ))
+    return {incident_id: row for incident_id, row in enumerate(INCIDENTS, 1)}
+
+async def assert_stats_consistent(session_factory):
+    # A rebuild recounts from incident; the incrementally maintained rollup must already agree
+    query = select(
+        models.IncidentStat.status_id, models.IncidentStat.office_id, models.IncidentStat.type_id,
+        models.IncidentStat.incident_count,
+    ).filter(models.IncidentStat.incident_count != 0)
+    async with session_factory() as db:
+        maintained = set((await db.execute(query)).all())
+        await crud.rebuild_incident_stats(db)
+        assert set((await db.execute(query)).all()) == maintained
+
+async def history_counts(session_factory, comment=None):
+    query = select(models.IncidentHistory.incident_id, func.count()).group_by(models.IncidentHistory.incident_id)
+    if comment is not None:
+        query = query.filter(models.IncidentHistory.comment == comment)
+    async with session_factory() as db:
+        return dict((await db.execute(query)).all())
+
+async def test_bulk_update_across_batches(session_factory, incidents):
+    selection = schemas.IncidentFilter(office_id=1)
+    changes = schemas.IncidentBulkUpdate(filters=selection, status_id=IN_PROGRESS, resolver_id=2, comment="En bloque")
+    async with session_factory() as db:
+        affected = await crud.bulk_update_incidents(db, changes, batch_size=BATCH_SIZE)
+
+    # Updated rows still match the filter; each one is visited once all the same
+    in_office = [incident_id for incident_id, (office_id, _, _) in incidents.items() if office_id == 1]
+    assert affected == in_office
+    async with session_factory() as db:
+        rows = dict((await db.execute(select(models.Incident.incident_id, models.Incident.status_id))).all())
+    assert all(rows[incident_id] == IN_PROGRESS for incident_id in in_office)
+
+    # Only incidents whose status actually changed get an entry on top of the opening one
+    changed = [incident_id for incident_id in in_office if incidents[incident_id][2] != IN_PROGRESS]
+    assert await history_counts(session_factory) == {incident_id: 1 + (incident_id in changed) for incident_id in incidents}
+    assert await history_counts(session_factory, comment="En bloque") == {incident_id: 1 for incident_id in changed}
+    await assert_stats_consistent(session_factory)
+
+async def test_bulk_delete_across_batches(session_factory, incidents):
+    selected = [2, 3, 5, 7, 8, 10, 11]
+    selection = schemas.IncidentBulkSelection(incident_ids=selected, filters=schemas.IncidentFilter(status_id=OPEN))
+    async with session_factory() as db:
+        deleted = await crud.bulk_delete_incidents(db, selection, batch_size=BATCH_SIZE)
+
+    expected = [incident_id for incident_id in selected if incidents[incident_id][2] == OPEN]
+    assert deleted == expected
+    async with session_factory() as db:
+        remaining = set((await db.execute(select(models.Incident.incident_id))).scalars())
+        tombstones = (await db.execute(
+            select(models.Tombstone.entity_id).filter(models.Tombstone.entity == "incident").order_by(models.Tombstone.entity_id)
+        )).scalars().all()
+    assert remaining == set(incidents) - set(expected)
+    assert tombstones == expected
+    assert set(await history_counts(session_factory)) == remaining
+    await assert_stats_consistent(session_factory)
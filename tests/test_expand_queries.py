@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app import crud, metrics, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+INCIDENTS = 25
+PAGE_SIZES = (1, 20)
+EXPANSIONS = ("", "status", "reporter,resolver", "office,device", "history", "status,reporter,resolver,office,device,history")
+
+@pytest.fixture
+async def incidents(session_factory):
+    opened_at = datetime(2026, 1, 1, 8)
+    async with session_factory() as db:
+        for number in range(INCIDENTS):
+            incident = models.Incident(
+                opened_at=opened_at + timedelta(hours=number), status_id=1 + number % 2, description=f"Incidencia {number}",
+                reporter_id=4 + number % 2, resolver_id=2 + number % 2, office_id=1 + number % 2, device_id=1 + number % 2,
+            )
+            db.add(incident)
+            await db.flush()
+            db.add_all([
+                models.IncidentHistory(incident_id=incident.incident_id, status_id=status_id, date=incident.opened_at)
+                for status_id in (1, 2)
+            ])
+        await db.commit()
+
+async def count_statements(session_factory, expand: str, limit: int) -> int:
+    # The same cursor hook MetricsMiddleware relies on counts every statement sent
+    stats = metrics.RequestStats()
+    token = metrics.current_request.set(stats)
+    try:
+        async with session_factory() as db:
+            page = await crud.get_incidents(db, schemas.IncidentFilter(), limit=limit, expand=crud.parse_expand(expand))
+    finally:
+        metrics.current_request.reset(token)
+    assert len(page["items"]) == limit
+    return stats.query_count
+
+@pytest.mark.parametrize("expand", EXPANSIONS)
+async def test_expand_query_count_does_not_grow_with_page_size(session_factory, incidents, expand):
+    counts = [await count_statements(session_factory, expand, limit) for limit in PAGE_SIZES]
+    assert counts[0] == counts[1], f"?expand={expand} ran {counts} statements for page sizes {PAGE_SIZES}"
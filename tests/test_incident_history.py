@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+from backend.app import crud, schemas
+from backend.app.pagination import decode_cursor
+
+pytestmark = pytest.mark.anyio
+
+OPEN, IN_PROGRESS, RESOLVED = 1, 2, 3
+
+async def create_incident(session_factory):
+    async with session_factory() as db:
+        db_incident = await crud.create_incident(db, schemas.IncidentCreate(
+            description="Incidencia", status_id=OPEN, reporter_id=4, office_id=1,
+        ))
+    return db_incident.incident_id
+
+async def update(session_factory, incident_id, **changes):
+    async with session_factory() as db:
+        assert await crud.update_incident(db, incident_id, schemas.IncidentUpdate(**changes)) is not None
+
+async def read_timeline(session_factory, incident_id, limit):
+    # Follows next_cursor to the end, as the timeline view does
+    items, cursor = [], None
+    while True:
+        async with session_factory() as db:
+            page = await crud.get_incident_history(db, incident_id, limit=limit, after=decode_cursor(cursor) if cursor else None)
+        assert len(page["items"]) <= limit
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+async def test_status_changes_write_history(session_factory):
+    incident_id = await create_incident(session_factory)
+    await update(session_factory, incident_id, status_id=IN_PROGRESS, resolver_id=2, comment="Asignada")
+    # Neither a field other than the status nor the same status again adds an entry
+    await update(session_factory, incident_id, description="Más detalle")
+    await update(session_factory, incident_id, status_id=IN_PROGRESS, comment="Sin cambio")
+    await update(session_factory, incident_id, status_id=RESOLVED, comment="Resuelta")
+
+    history = await read_timeline(session_factory, incident_id, limit=50)
+    assert [(entry["status_id"], entry["comment"]) for entry in history] == [
+        (OPEN, None), (IN_PROGRESS, "Asignada"), (RESOLVED, "Resuelta"),
+    ]
+    assert {entry["incident_id"] for entry in history} == {incident_id}
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7])
+async def test_timeline_pages_cover_every_entry_once(session_factory, limit):
+    incident_id = await create_incident(session_factory)
+    other_id = await create_incident(session_factory)
+    async with session_factory() as db:
+        # Entries sharing a timestamp are ordered by id, so pages split ties cleanly
+        for number in range(12):
+            crud.add_incident_history(db, incident_id, OPEN + number % 3, datetime(2026, 3, 1, 8, number // 4), f"Paso {number}")
+        crud.add_incident_history(db, other_id, RESOLVED, datetime(2026, 3, 1, 8), "Otra")
+        await db.commit()
+
+    items = await read_timeline(session_factory, incident_id, limit)
+    full = await read_timeline(session_factory, incident_id, limit=100)
+    assert items == full
+    assert len(full) == 13
+    keys = [(entry["date"], entry["history_id"]) for entry in full]
+    assert keys == sorted(keys) and len(set(keys)) == len(keys)
+    assert "Otra" not in {entry["comment"] for entry in full}
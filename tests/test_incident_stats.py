@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from backend.app import crud, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+OPEN, IN_PROGRESS, RESOLVED = 1, 2, 3
+# (office, device): device 1 is a laptop in office 1, device 2 a printer in office 2
+INCIDENTS = ((1, 1), (1, None), (2, 2), (2, None), (1, 2), (2, 1))
+
+async def rollup(db):
+    result = await db.execute(
+        select(models.IncidentStat.status_id, models.IncidentStat.office_id, models.IncidentStat.type_id, models.IncidentStat.incident_count)
+        .filter(models.IncidentStat.incident_count != 0)
+    )
+    return {(status_id, office_id, type_id): count for status_id, office_id, type_id, count in result.all()}
+
+async def grouped(db):
+    office_id = func.coalesce(models.Incident.office_id, 0)
+    type_id = func.coalesce(models.Device.type_id, 0)
+    result = await db.execute(
+        select(models.Incident.status_id, office_id, type_id, func.count())
+        .outerjoin(models.Device, models.Device.device_id == models.Incident.device_id)
+        .group_by(models.Incident.status_id, office_id, type_id)
+    )
+    return {(status_id, office, device_type): count for status_id, office, device_type, count in result.all()}
+
+async def assert_rollup_matches(session_factory):
+    async with session_factory() as db:
+        expected = await grouped(db)
+        assert await rollup(db) == expected
+        stats = await crud.get_incident_stats(db)
+    assert stats["total"] == sum(expected.values())
+    by_status = {}
+    for (status_id, _, _), count in expected.items():
+        by_status[status_id] = by_status.get(status_id, 0) + count
+    assert {group["id"]: group["count"] for group in stats["by_status"]} == by_status
+
+async def test_rollup_follows_creates_updates_and_deletes(session_factory):
+    async with session_factory() as db:
+        for number, (office_id, device_id) in enumerate(INCIDENTS):
+            await crud.create_incident(db, schemas.IncidentCreate(
+                description=f"Incidencia {number}", status_id=OPEN, reporter_id=4,
+                office_id=office_id, device_id=device_id,
+            ))
+    await assert_rollup_matches(session_factory)
+
+    changes = (
+        (1, schemas.IncidentUpdate(status_id=IN_PROGRESS, resolver_id=2)),
+        (2, schemas.IncidentUpdate(device_id=2)),
+        (3, schemas.IncidentUpdate(status_id=RESOLVED, device_id=1)),
+        (4, schemas.IncidentUpdate(description="Solo texto")),
+        (1, schemas.IncidentUpdate(status_id=RESOLVED)),
+    )
+    for incident_id, change in changes:
+        async with session_factory() as db:
+            assert await crud.update_incident(db, incident_id, change) is not None
+        await assert_rollup_matches(session_factory)
+
+    for incident_id in (3, 5):
+        async with session_factory() as db:
+            assert await crud.delete_incident(db, incident_id)
+        await assert_rollup_matches(session_factory)
+
+async def test_rebuild_matches_incremental_rollup(session_factory):
+    async with session_factory() as db:
+        for number, (office_id, device_id) in enumerate(INCIDENTS):
+            await crud.create_incident(db, schemas.IncidentCreate(
+                description=f"Incidencia {number}", status_id=OPEN + number % 3, reporter_id=4,
+                office_id=office_id, device_id=device_id,
+            ))
+    async with session_factory() as db:
+        incremental = await rollup(db)
+        await crud.rebuild_incident_stats(db)
+        assert await rollup(db) == incremental == await grouped(db)
@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.future import select
+
+from backend.app import jobs, models
+from backend.app.models import utcnow
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def submitted(monkeypatch):
+    # What the post-commit hook hands to the worker pool
+    job_ids = []
+    monkeypatch.setattr(jobs, "submit", job_ids.append)
+    return job_ids
+
+@pytest.fixture
+def handler(monkeypatch):
+    # Each test's handler adds an office named after the payload, then does whatever the test asks
+    def register(after_write=None):
+        async def add_office(db, payload):
+            db.add(models.Office(city=payload))
+            await db.flush()
+            if after_write is not None:
+                await after_write(payload)
+        monkeypatch.setitem(jobs.handlers, "add_office", add_office)
+    return register
+
+async def enqueue(session_factory, payload):
+    async with session_factory() as db:
+        job = jobs.enqueue(db, "add_office", payload)
+        await db.commit()
+    return job.job_id
+
+async def load_job(session_factory, job_id):
+    async with session_factory() as db:
+        return await db.get(models.OutboxJob, job_id)
+
+async def office_cities(session_factory):
+    async with session_factory() as db:
+        return set((await db.execute(select(models.Office.city))).scalars())
+
+async def make_due(session_factory, job_id):
+    # Stands in for the backoff delay passing
+    async with session_factory() as db:
+        await db.execute(update(models.OutboxJob).where(models.OutboxJob.job_id == job_id).values(run_after=utcnow()))
+        await db.commit()
+
+async def test_job_exists_only_if_the_transaction_commits(session_factory, submitted, handler):
+    handler()
+    async with session_factory() as db:
+        jobs.enqueue(db, "add_office", "Bilbao")
+        await db.rollback()
+    async with session_factory() as db:
+        assert (await db.execute(select(models.OutboxJob))).scalars().all() == []
+    assert submitted == []
+
+    job_id = await enqueue(session_factory, "Valencia")
+    assert submitted == [job_id]
+    assert await jobs.run_job(session_factory, job_id)
+    # The handler's write and the removal of the job commit together
+    assert "Valencia" in await office_cities(session_factory)
+    assert await load_job(session_factory, job_id) is None
+    assert not await jobs.run_job(session_factory, job_id)
+
+async def test_failed_job_rolls_back_its_writes_and_backs_off(session_factory, submitted, handler):
+    async def fail(payload):
+        raise RuntimeError("fallo")
+    handler(fail)
+    job_id = await enqueue(session_factory, "Bilbao")
+
+    for attempts in (1, 2, 3):
+        started = utcnow()
+        assert not await jobs.run_job(session_factory, job_id)
+        job = await load_job(session_factory, job_id)
+        assert "Bilbao" not in await office_cities(session_factory)
+        assert job.attempts == attempts and job.locked_until is None and job.failed_at is None
+        assert "fallo" in job.last_error
+        # Exponential, with up to a quarter of jitter taken off
+        delay = jobs.RETRY_BASE_DELAY * 2 ** (attempts - 1)
+        assert started + timedelta(seconds=delay * 0.75) <= job.run_after <= utcnow() + timedelta(seconds=delay)
+        # Not due again until the delay has passed
+        async with session_factory() as db:
+            assert job_id not in await jobs.fetch_due(db, 10)
+        assert not await jobs.run_job(session_factory, job_id)
+        await make_due(session_factory, job_id)
+
+async def test_job_fails_for_good_after_max_attempts(session_factory, submitted, handler, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_MAX_ATTEMPTS", 3)
+    outcome = {"fail": True}
+    async def fail(payload):
+        if outcome["fail"]:
+            raise RuntimeError("fallo")
+    handler(fail)
+    job_id = await enqueue(session_factory, "Bilbao")
+
+    for _ in range(3):
+        assert not await jobs.run_job(session_factory, job_id)
+        await make_due(session_factory, job_id)
+    job = await load_job(session_factory, job_id)
+    assert job.attempts == 3 and job.failed_at is not None
+    async with session_factory() as db:
+        assert await jobs.fetch_due(db, 10) == []
+
+    # An operator retry starts the count over
+    outcome["fail"] = False
+    async with session_factory() as db:
+        assert await jobs.retry_failed_jobs(db) == 1
+    assert await jobs.run_job(session_factory, job_id)
+    assert "Bilbao" in await office_cities(session_factory)
+
+async def test_job_that_loses_its_lease_does_not_commit(session_factory, submitted, monkeypatch):
+    lost_leases = jobs.stats.lost_leases
+
+    async def take_over_then_write(db, payload):
+        # The lease ran out and another worker claimed the job meanwhile (first, since
+        # SQLite would make that worker wait for this session's write lock)
+        async with session_factory() as other:
+            await other.execute(
+                update(models.OutboxJob)
+                .where(models.OutboxJob.name == "add_office")
+                .values(locked_until=utcnow() + timedelta(seconds=jobs.JOBS_LEASE * 2))
+            )
+            await other.commit()
+        db.add(models.Office(city=payload))
+        await db.flush()
+    monkeypatch.setitem(jobs.handlers, "add_office", take_over_then_write)
+    job_id = await enqueue(session_factory, "Bilbao")
+
+    assert not await jobs.run_job(session_factory, job_id)
+    assert jobs.stats.lost_leases == lost_leases + 1
+    assert "Bilbao" not in await office_cities(session_factory)
+    # Still in the outbox, owned by the worker that took it over
+    job = await load_job(session_factory, job_id)
+    assert job is not None and job.attempts == 1 and job.failed_at is None
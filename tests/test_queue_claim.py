@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from backend.app import crud, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+OPEN, IN_PROGRESS = 1, 2
+TECHNICIANS = (2, 3)
+QUEUED = 40
+CLAIMERS = 8
+
+async def queue_incidents(session_factory, offices):
+    opened_at = datetime(2026, 1, 1, 8)
+    async with session_factory() as db:
+        for number, office_id in enumerate(offices):
+            await crud.create_incident(db, schemas.IncidentCreate(
+                description=f"Incidencia {number}", status_id=OPEN, reporter_id=4, office_id=office_id,
+                opened_at=opened_at + timedelta(minutes=number),
+            ))
+
+async def load_users(session_factory, user_ids):
+    async with session_factory() as db:
+        result = await db.execute(select(models.User).filter(models.User.user_id.in_(user_ids)))
+        users = {user.user_id: user for user in result.scalars()}
+    return [users[user_id] for user_id in user_ids]
+
+async def claim(session_factory, technician):
+    async with session_factory() as db:
+        db_incident = await crud.claim_next_incident(db, technician)
+    return db_incident.incident_id if db_incident else None
+
+async def test_concurrent_claims_assign_each_incident_once(session_factory):
+    await queue_incidents(session_factory, [1 + number % 2 for number in range(QUEUED)])
+    technicians = await load_users(session_factory, TECHNICIANS)
+    claims = []
+
+    async def claimer(technician):
+        while (incident_id := await claim(session_factory, technician)) is not None:
+            claims.append((incident_id, technician.user_id))
+
+    await asyncio.gather(*(claimer(technicians[number % 2]) for number in range(CLAIMERS)))
+
+    claimed = [incident_id for incident_id, _ in claims]
+    assert len(claimed) == len(set(claimed)) == QUEUED
+    async with session_factory() as db:
+        rows = (await db.execute(select(models.Incident.incident_id, models.Incident.resolver_id, models.Incident.status_id))).all()
+        history = (await db.execute(
+            select(models.IncidentHistory.incident_id, func.count())
+            .filter(models.IncidentHistory.status_id == IN_PROGRESS)
+            .group_by(models.IncidentHistory.incident_id)
+        )).all()
+    # Each incident belongs to the technician whose call returned it, and was claimed once
+    assert {incident_id: resolver_id for incident_id, resolver_id, _ in rows} == dict(claims)
+    assert {status_id for _, _, status_id in rows} == {IN_PROGRESS}
+    assert dict(history) == {incident_id: 1 for incident_id in claimed}
+
+async def test_claim_prefers_own_office_then_oldest(session_factory):
+    # Office 1 holds the oldest incidents; the office 2 technician drains its own first
+    await queue_incidents(session_factory, [1, 1, 2, 2])
+    office_2_technician, = await load_users(session_factory, (3,))
+    assert [await claim(session_factory, office_2_technician) for _ in range(5)] == [3, 4, 1, 2, None]
@@ -0,0 +1,27 @@
+import pytest
+
+from backend.app import crud, schemas, search
+
+pytestmark = pytest.mark.anyio
+
+DESCRIPTIONS = (
+    '<img src=x onerror=alert(1)> impresora rota',
+    'La impresora & el "papel" <script>alert(1)</script>',
+    'Pantalla sin señal',
+)
+
+async def test_highlight_escapes_the_description(session_factory):
+    async with session_factory() as db:
+        for description in DESCRIPTIONS:
+            await crud.create_incident(db, schemas.IncidentCreate(
+                description=description, status_id=1, reporter_id=4, office_id=1,
+            ))
+        page = await search.search_incidents(db, "impresora", schemas.IncidentFilter())
+
+    assert sorted(item["incident_id"] for item in page["items"]) == [1, 2]
+    for item in page["items"]:
+        highlight = item["highlight"]
+        # The only markup left is the match marker around the search term
+        assert highlight.replace("<mark>impresora</mark>", "").count("<") == 0
+        assert "<mark>impresora</mark>" in highlight
+        assert search.MATCH_START not in highlight and search.MATCH_STOP not in highlight
@@ -0,0 +1,54 @@
+import pytest
+
+from backend.app import crud, models, schemas, sync
+from backend.app.pagination import decode_watermark
+
+pytestmark = pytest.mark.anyio
+
+OPEN = 1
+
+async def create_incidents(session_factory, reporters):
+    async with session_factory() as db:
+        for number, reporter_id in enumerate(reporters):
+            await crud.create_incident(db, schemas.IncidentCreate(
+                description=f"Incidencia {number}", status_id=OPEN, reporter_id=reporter_id, office_id=1,
+            ))
+
+async def sync_all(session_factory, watermark, **kwargs):
+    # Follows has_more to the end, as a client does
+    seen = []
+    while True:
+        async with session_factory() as db:
+            page = await sync.get_changes(db, decode_watermark(watermark) if watermark else {}, limit=2, **kwargs)
+        seen += [incident.incident_id for incident in page["incidents"]]
+        watermark = page["watermark"]
+        if not page["has_more"]:
+            return seen, watermark
+
+async def test_write_committed_after_a_sync_is_not_skipped(session_factory):
+    await create_incidents(session_factory, [4, 4, 4])
+    seen, watermark = await sync_all(session_factory, None)
+    assert seen == [1, 2, 3]
+
+    async with session_factory() as slow:
+        postgres = slow.get_bind().dialect.name == "postgresql"
+        (await slow.get(models.Incident, 1)).description = "Lenta"
+        await slow.flush()
+        if postgres:
+            # A later transaction commits first; SQLite would queue it behind the open one
+            async with session_factory() as db:
+                (await db.get(models.Incident, 2)).description = "Rápida"
+                await db.commit()
+        # Nothing is handed out past the transaction that is still open
+        seen, watermark = await sync_all(session_factory, watermark)
+        assert seen == []
+        await slow.commit()
+
+    seen, watermark = await sync_all(session_factory, watermark)
+    assert sorted(seen) == ([1, 2] if postgres else [1])
+    assert (await sync_all(session_factory, watermark))[0] == []
+
+async def test_regular_users_only_sync_their_own_incidents(session_factory):
+    await create_incidents(session_factory, [4, 5, 4, 5, 4])
+    assert (await sync_all(session_factory, None, reporter_id=4))[0] == [1, 3, 5]
+    assert (await sync_all(session_factory, None))[0] == [1, 2, 3, 4, 5]